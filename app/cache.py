@@ -0,0 +1,72 @@
+"""Short-lived in-process caches: TTL entries, single-flight fetches, safe invalidation."""
+
+import asyncio
+import time
+
+
+class Cache:
+    """TTL cache whose concurrent misses for a key share a single fetch.
+
+    invalidate() bumps a per-key generation, so fetches started before it
+    never store their result.
+    """
+
+    def __init__(self):
+        self._values: dict[tuple, tuple[float, object]] = {}
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._generations: dict[tuple, int] = {}
+
+    async def cached(self, key: tuple, ttl: float, fetch, *args):
+        """Return the cached result for key, calling fetch(*args) when missing or expired.
+
+        A None result (no answer, e.g. a timeout) is returned but not cached.
+        """
+        value = self.peek(key)
+        if value is not None:
+            return value
+        generation = self.generation(key)
+        value = await self.singleflight(key, fetch, *args)
+        self.store(key, ttl, value, generation)
+        return value
+
+    async def singleflight(self, key: tuple, fetch, *args):
+        """Run fetch(*args) once for all concurrent callers with the same key."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch(*args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_inflight(key, done))
+        # Shield so one cancelled caller doesn't cancel the others' result
+        return await asyncio.shield(task)
+
+    def peek(self, key: tuple):
+        """The cached value if present and fresh, else None - never fetches."""
+        entry = self._values.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def generation(self, key: tuple) -> int:
+        """Current generation of key; pass it to store() after a fetch."""
+        return self._generations.get(key, 0)
+
+    def store(self, key: tuple, ttl: float, value, generation: int) -> None:
+        """Cache value unless it is None or key was invalidated since generation."""
+        if value is not None and self.generation(key) == generation:
+            self._values[key] = (time.monotonic() + ttl, value)
+
+    def invalidate(self, key: tuple) -> None:
+        """Drop a cached value; fetches already in flight won't write it back or be shared."""
+        self._values.pop(key, None)
+        self._inflight.pop(key, None)
+        self._generations[key] = self.generation(key) + 1
+
+    def _forget_inflight(self, key: tuple, task: asyncio.Future) -> None:
+        """Drop a finished fetch, unless a newer one already took its key."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+
+# Shared by the routers for page data
+_cache = Cache()
+cached = _cache.cached
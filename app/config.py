@@ -12,6 +12,9 @@ class Settings(BaseSettings):
     dokku_host: str = "128.140.127.105"
     dokku_user: str = "dokku"
     dokku_ssh_key: str = "/root/.ssh/id_rsa"
+    dokku_ssh_connections: int = 4
+    dokku_max_sessions: int = 8  # per connection; keep below sshd's MaxSessions (default 10)
+    dokku_max_subprocesses: int = 16  # concurrent local dokku/ssh processes
 
     # App settings
     app_name: str = "Dokku Dashboard"
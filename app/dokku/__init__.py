@@ -1,8 +1,6 @@
 """Dokku client module."""
 
-from app.dokku.client import DokkuClient
+from app.dokku.client import DokkuClient, get_client
 from app.dokku.models import App, AppStatus, EnvVar
 
-__all__ = ["DokkuClient", "App", "AppStatus", "EnvVar"]
-
-
+__all__ = ["DokkuClient", "get_client", "App", "AppStatus", "EnvVar"]
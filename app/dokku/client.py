@@ -1,18 +1,238 @@
 """Dokku client - uses Docker socket when available, SSH as fallback."""
 
 import asyncio
+import itertools
+import json
 import os
 import re
+import shlex
+import stat
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import AsyncIterator
 
 import asyncssh
+import httpx
 
+from app.cache import Cache
 from app.config import get_settings
-from app.dokku.models import App, AppStatus, EnvVar
+from app.dokku.models import App, AppStatus, EnvVar, ProcessScale, SSLCertificate
 
-# Check if we can use Docker directly
 DOCKER_SOCKET = "/var/run/docker.sock"
-USE_DOCKER = os.path.exists(DOCKER_SOCKET)
+
+# Private directory for run_fast's OpenSSH ControlMaster sockets
+SSH_CONTROL_DIR = os.path.expanduser("~/.dokku-dashboard")
+
+# An unreachable host should fail fast, not wait out the OS TCP / 120s login timeouts
+SSH_CONNECT_TIMEOUT = 10
+
+# Cipher preference for the asyncssh connection: AES-GCM runs on AES-NI through
+# OpenSSL, cheaper per byte than asyncssh's default chacha20-poly1305 first choice
+SSH_CIPHERS = [
+    "aes128-gcm@openssh.com",
+    "aes256-gcm@openssh.com",
+    "chacha20-poly1305@openssh.com",
+    "aes128-ctr",
+    "aes256-ctr",
+]
+
+# Issuing or renewing a certificate touches this directory
+LETSENCRYPT_DIR = "/home/dokku/.letsencrypt"
+
+# letsencrypt:list row: "app_name    2026-01-20 05:25:37    39d, 8h, 3m, 2s    9d, 8h, 3m, 2s"
+SSL_ROW_RE = re.compile(
+    rb"^[ \t]*(\S+)[ \t]+(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})[ \t]+(?:(\d+)d,)?", re.M
+)
+
+# Entries in /home/dokku that are not apps
+SKIP_DIRS = frozenset({"ENV", "VHOST", "tls", "dokkurc", ".basher", ".cache", ".config", ".ssh", ".local"})
+
+# Commands safe to share between concurrent callers (no side effects)
+READ_ONLY_COMMANDS = {"apps:list", "config:show", "logs", "report"}
+
+# Section headers in `dokku report` output, e.g. "=====> my-app ps information"
+REPORT_HEADER_RE = re.compile(r"^=====> (\S+) (\S+) information\s*$", re.M)
+
+# Names safe to use as filesystem paths / ENV keys without asking dokku
+APP_NAME_RE = re.compile(r"[a-z0-9][a-z0-9-]*")
+ENV_KEY_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+# Env var names that should be masked in the UI
+SENSITIVE_RE = re.compile(r"password|secret|key|token|api|private", re.I)
+
+# "KEY:   value" lines from config:show (header lines start with "=")
+CONFIG_LINE_RE = re.compile(r"^[ \t]*([^:=\s][^:\n]*):(.*)$", re.M)
+
+# ps:report "Running:" field -> app status ("mixed": some processes are down)
+PS_RUNNING_STATUS = {
+    "true": AppStatus.RUNNING,
+    "false": AppStatus.STOPPED,
+    "mixed": AppStatus.CRASHED,
+}
+
+NUM_RE = re.compile(r"\d+")
+
+# Card URL for an app without custom domains in the SSH listing
+DEFAULT_URL = "https://{}.brewbytes.dev"
+
+# Aggregated container state (see _get_apps_from_docker) -> app status
+DOCKER_STATE_STATUS = {
+    "running": AppStatus.RUNNING,
+    "restarting": AppStatus.RESTARTING,
+    "starting": AppStatus.STARTING,
+    "exited": AppStatus.STOPPED,
+    "dead": AppStatus.STOPPED,
+    "stopped": AppStatus.STOPPED,
+}
+
+
+@lru_cache
+def _use_docker() -> bool:
+    """Check once whether we can use Docker directly (clear with _use_docker.cache_clear())."""
+    return os.path.exists(DOCKER_SOCKET)
+
+
+@lru_cache
+def _load_key(path: str) -> asyncssh.SSHKey:
+    """Read and parse the SSH private key once per process."""
+    return asyncssh.read_private_key(path)
+
+
+def _scan_home(root: str, skip: frozenset[str]) -> list[str] | None:
+    """List app directories under the dokku home (blocking - run in a thread).
+
+    Returns None if the directory does not exist.
+    """
+    # DirEntry carries the file type, so non-directories cost no extra stat
+    try:
+        with os.scandir(root) as entries:
+            return [
+                entry.name for entry in entries
+                if entry.is_dir(follow_symlinks=False)
+                and not entry.name.startswith(".")
+                and entry.name not in skip
+            ]
+    except FileNotFoundError:
+        return None
+    except OSError:
+        return []
+
+
+def _letsencrypt_mtime() -> int | None:
+    """mtime of the letsencrypt dir, or None if it can't be stat'ed."""
+    try:
+        return os.stat(LETSENCRYPT_DIR).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _docker_error(response: httpx.Response) -> str:
+    """Get the message from a Docker API error response."""
+    try:
+        return response.json()["message"]
+    except (ValueError, KeyError, TypeError):
+        return f"HTTP {response.status_code}"
+
+
+def _dokku_env_line(key: str, value: str) -> str:
+    """Format one ENV line exactly as dokku writes it: single quotes, ' as '\\''."""
+    escaped = value.replace("'", "'\\''")
+    return f"export {key}='{escaped}'\n"
+
+
+def _format_env(env: dict[str, str]) -> str:
+    """Render a whole ENV file the way dokku's config plugin does: keys sorted."""
+    return "".join(_dokku_env_line(key, env[key]) for key in sorted(env))
+
+
+def _parse_env_file(text: str) -> dict[str, str]:
+    """Parse a whole ENV file with shell quoting, so multi-line values survive.
+
+    Raises ValueError unless every word is `export` or a KEY=value assignment.
+    """
+    env = {}
+    for word in shlex.split(text):
+        if word == "export":
+            continue
+        key, sep, value = word.partition("=")
+        if not (sep and ENV_KEY_RE.fullmatch(key)):
+            raise ValueError(f"unexpected word in ENV file: {word[:40]!r}")
+        env[key] = value
+    return env
+
+
+async def _demux_docker_log(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Strip the 8-byte frame headers Docker puts on non-TTY log streams."""
+    buf = bytearray()
+    framed = None
+    async for chunk in chunks:
+        buf += chunk
+        if framed is None:
+            if len(buf) < 8:
+                continue
+            # Frames start with a stream byte (0-2) and three zero bytes; TTY output is raw
+            framed = buf[0] <= 2 and buf[1:4] == b"\0\0\0"
+        if not framed:
+            yield bytes(buf)
+            buf.clear()
+            continue
+        while len(buf) >= 8:
+            size = int.from_bytes(buf[4:8], "big")
+            if len(buf) < 8 + size:
+                break
+            yield bytes(buf[8:8 + size])
+            del buf[:8 + size]
+    if buf and not framed:
+        yield bytes(buf)
+
+
+class SSHPool:
+    """A few long-lived SSH connections with sessions spread round-robin across them."""
+
+    def __init__(self, connect, size: int, max_sessions: int):
+        self._connect = connect
+        self._conns: list[asyncssh.SSHClientConnection | None] = [None] * size
+        self._locks = [asyncio.Lock() for _ in range(size)]
+        # Per-connection session cap, kept below sshd's MaxSessions
+        self._sems = [asyncio.Semaphore(max_sessions) for _ in range(size)]
+        self._slots = itertools.cycle(range(size))
+
+    async def _open(self, slot: int) -> asyncssh.SSHClientConnection:
+        """Get a slot's connection, (re)opening it when missing or closed."""
+        conn = self._conns[slot]
+        if conn is None or conn.is_closed():
+            async with self._locks[slot]:
+                conn = self._conns[slot]
+                if conn is None or conn.is_closed():
+                    conn = self._conns[slot] = await self._connect()
+        return conn
+
+    async def acquire(self) -> asyncssh.SSHClientConnection:
+        """Get the next connection without holding a session slot (long-lived streams)."""
+        return await self._open(next(self._slots))
+
+    @asynccontextmanager
+    async def session(self):
+        """Hold one session slot on the next connection for a short command."""
+        slot = next(self._slots)
+        async with self._sems[slot]:
+            yield await self._open(slot)
+
+    def discard(self, conn: asyncssh.SSHClientConnection) -> None:
+        """Forget a broken connection so its slot reconnects on next use."""
+        self._conns = [None if c is conn else c for c in self._conns]
+        conn.close()
+
+    async def close(self) -> None:
+        """Close every open connection."""
+        conns = [c for c in self._conns if c is not None]
+        self._conns = [None] * len(self._conns)
+        for conn in conns:
+            conn.close()
+        for conn in conns:
+            await conn.wait_closed()
 
 
 class DokkuClient:
@@ -23,17 +243,102 @@ class DokkuClient:
         self.host = settings.dokku_host
         self.user = settings.dokku_user
         self.key_path = settings.dokku_ssh_key
-        self.use_docker = USE_DOCKER
+        self.use_docker = _use_docker()
+        self._pool = SSHPool(self._connect, settings.dokku_ssh_connections, settings.dokku_max_sessions)
+        self._cache = Cache()
+        self._docker: httpx.AsyncClient | None = None
+        self._home_missing_until = 0.0
+        self._file_cache: dict[str, tuple[int, float, object]] = {}
+        self._env_locks: dict[str, asyncio.Lock] = {}
+        self._subprocess_slots = asyncio.Semaphore(settings.dokku_max_subprocesses)
+        # ssh falls back to a plain connection if the socket dir is unusable
+        try:
+            os.makedirs(SSH_CONTROL_DIR, mode=0o700, exist_ok=True)
+        except OSError:
+            pass
 
     async def _connect(self) -> asyncssh.SSHClientConnection:
         """Create SSH connection."""
         return await asyncssh.connect(
             self.host,
             username=self.user,
-            client_keys=[self.key_path],
+            client_keys=[_load_key(self.key_path)],
             known_hosts=None,  # Skip host key verification for simplicity
+            keepalive_interval=30,
+            encryption_algs=SSH_CIPHERS,
+            connect_timeout=SSH_CONNECT_TIMEOUT,
+            login_timeout=SSH_CONNECT_TIMEOUT,
         )
 
+    async def warm_up(self) -> None:
+        """Open an SSH connection ahead of the first request."""
+        if self.use_docker:
+            return  # Docker mode never touches SSH
+        try:
+            await self._pool.acquire()
+        except (OSError, asyncssh.Error):
+            pass  # Not fatal - the first command will try to connect again
+
+    async def close(self) -> None:
+        """Close the SSH connections and Docker API client."""
+        await self._pool.close()
+        docker, self._docker = self._docker, None
+        if docker is not None:
+            await docker.aclose()
+
+    def _docker_api(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client for the Docker Engine API on the UNIX socket."""
+        if self._docker is None:
+            self._docker = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(uds=DOCKER_SOCKET),
+                base_url="http://docker",
+                timeout=30,
+            )
+        return self._docker
+
+    async def _list_containers(self, app_name: str | None = None, include_stopped: bool = True) -> list[dict]:
+        """List Dokku containers via the Docker API (same data as `docker ps`)."""
+        label = f"com.dokku.app-name={app_name}" if app_name else "com.dokku.app-name"
+        params = {"filters": json.dumps({"label": [label]})}
+        if include_stopped:
+            params["all"] = "true"
+        try:
+            response = await self._docker_api().get("/containers/json", params=params)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return []
+        return response.json()
+
+    async def container_states(self) -> dict[str, tuple[str, str]]:
+        """Get {container name: (state, image)} for every container via the Docker API."""
+        try:
+            response = await self._docker_api().get("/containers/json", params={"all": "true"})
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return {}
+        return {
+            name.lstrip("/"): (container["State"], container["Image"])
+            for container in response.json()
+            for name in container["Names"]
+        }
+
+    async def _dokku_containers(self) -> list[dict]:
+        """All Dokku containers, shared by every Docker-mode reader for half a second."""
+        # Concurrent misses coalesce onto one API call; the short TTL absorbs bursts
+        return await self._cache.cached(("containers",), 0.5, self._list_containers)
+
+    def _invalidate(self, app_name: str) -> None:
+        """Drop cached reads for an app after a mutating command."""
+        # Also drops in-flight fetches, so post-change callers don't share one
+        # that started before the change - including the shared run() reads
+        quoted = shlex.quote(app_name)
+        for key in (
+            ("all_apps",), ("containers",), ("app_status", app_name), ("config_list", app_name),
+            ("app_info", app_name), ("report", app_name),
+            ("run", f"report {quoted}"), ("run", f"ps:report {quoted}"), ("run", f"config:show {quoted}"),
+        ):
+            self._cache.invalidate(key)
+
     async def run_fast(self, command: str, timeout: int = 30) -> str:
         """Execute a dokku command using subprocess (faster for large output)."""
         ssh_cmd = [
@@ -42,98 +347,147 @@ class DokkuClient:
             "-o", "StrictHostKeyChecking=no",
             "-o", "UserKnownHostsFile=/dev/null",
             "-o", "LogLevel=ERROR",
+            # Reuse one master connection across invocations
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={SSH_CONTROL_DIR}/cm-%C",
+            "-o", "ControlPersist=600",
             f"{self.user}@{self.host}",
             command,
         ]
-        proc = await asyncio.create_subprocess_exec(
-            *ssh_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
         try:
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
-            return stdout.decode() or stderr.decode() or ""
-        except asyncio.TimeoutError:
-            proc.kill()
+            stdout, stderr = await self._exec(*ssh_cmd, timeout=timeout)
+        except TimeoutError:
             return ""
+        data = stdout or stderr
+        return data.decode("utf-8", errors="replace") if data else ""
 
-    async def run(self, command: str, timeout: int = 30) -> str:
-        """Execute a dokku command and return output."""
-        async with await self._connect() as conn:
-            result = await asyncio.wait_for(
-                conn.run(command, check=False),
-                timeout=timeout,
+    async def _exec(self, *argv: str, timeout: float | None = None) -> tuple[bytes, bytes]:
+        """Run a local command and return (stdout, stderr), capping concurrent processes."""
+        # A burst of page loads would otherwise fork dozens of dokku/ssh processes at once
+        async with self._subprocess_slots:
+            proc = await asyncio.create_subprocess_exec(
+                *argv,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
             )
-            return result.stdout or result.stderr or ""
+            return await self._communicate(proc, timeout)
+
+    async def _communicate(self, proc: asyncio.subprocess.Process, timeout: float | None) -> tuple[bytes, bytes]:
+        """proc.communicate() with a timeout that terminates and reaps the process."""
+        try:
+            async with asyncio.timeout(timeout):
+                return await proc.communicate()
+        except TimeoutError:
+            # SIGTERM first so it can shut down cleanly (ssh closes its channel),
+            # SIGKILL after a grace period, and always reap - no zombies
+            try:
+                proc.terminate()
+                async with asyncio.timeout(1.0):
+                    await proc.wait()
+            except ProcessLookupError:
+                pass  # Exited on its own just as the timeout fired
+            except TimeoutError:
+                proc.kill()
+                await proc.wait()
+            raise
+
+    async def run(self, command: str, timeout: int = 30) -> str:
+        """Execute a dokku command and return output.
+
+        Identical read-only commands already in flight are shared rather than re-run.
+        """
+        subcommand = command.split(maxsplit=1)[0] if command else ""
+        if subcommand in READ_ONLY_COMMANDS or subcommand.endswith(":report"):
+            return await self._cache.singleflight(("run", command), self._run, command, timeout)
+        return await self._run(command, timeout)
+
+    async def _run(self, command: str, timeout: int = 30) -> str:
+        """Execute a dokku command over a pooled connection and return output."""
+        try:
+            return await self._run_once(command, timeout)
+        except (asyncssh.ChannelOpenError, asyncssh.ConnectionLost):
+            # Stale connection (server restart, idle drop) - retry once on a fresh one
+            return await self._run_once(command, timeout)
+
+    async def _run_once(self, command: str, timeout: int) -> str:
+        """Run a command in one session, discarding the connection if it broke."""
+        async with self._pool.session() as conn:
+            try:
+                # asyncssh closes the channel itself on timeout, unlike a cancelled wait_for
+                result = await conn.run(command, check=False, timeout=timeout)
+            except asyncssh.TimeoutError:
+                return ""
+            except (asyncssh.ChannelOpenError, asyncssh.ConnectionLost):
+                self._pool.discard(conn)
+                raise
+        return result.stdout or result.stderr or ""
 
     async def apps_list(self) -> list[str]:
-        """Get list of all app names."""
+        """Get list of all app names (cached for 30s)."""
+        return await self._cache.cached(("apps_list",), 30, self._apps_list)
+
+    async def _apps_list(self) -> list[str]:
+        """Fetch app names via apps:list."""
         output = await self.run("apps:list")
-        lines = output.strip().split("\n")
-        # Skip header line "=====> My Apps"
-        return [line.strip() for line in lines[1:] if line.strip()]
+        # Skip header line(s) like "=====> My Apps" wherever they appear
+        return [
+            line.strip() for line in output.splitlines()
+            if line.strip() and not line.startswith("=====>")
+        ]
 
     async def app_status(self, app_name: str) -> AppStatus:
-        """Get app running status."""
+        """Get app running status (cached for 5s)."""
+        return await self._cache.cached(("app_status", app_name), 5, self._fetch_app_status, app_name)
+
+    async def _fetch_app_status(self, app_name: str) -> AppStatus:
+        """Fetch app status from Docker or SSH."""
         if self.use_docker:
             return await self._app_status_docker(app_name)
         return await self._app_status_ssh(app_name)
 
     async def _app_status_docker(self, app_name: str) -> AppStatus:
         """Get app status from Docker - instant."""
-        proc = await asyncio.create_subprocess_exec(
-            "docker", "ps", "-q",
-            "--filter", f"label=com.dokku.app-name={app_name}",
-            "--filter", "status=running",
-            stdout=asyncio.subprocess.PIPE,
+        status, _ = await self._ps_report_docker(app_name)
+        return status
+
+    async def _ps_report_docker(self, app_name: str) -> tuple[AppStatus, int]:
+        """Get app status and running container count from one container listing."""
+        container_count = sum(
+            1 for container in await self._dokku_containers()
+            if container["Labels"].get("com.dokku.app-name") == app_name
+            and container["State"] == "running"
         )
-        stdout, _ = await proc.communicate()
-        if stdout.strip():
-            return AppStatus.RUNNING
-        return AppStatus.STOPPED
+        status = AppStatus.RUNNING if container_count else AppStatus.STOPPED
+        return status, container_count
 
     async def _app_status_ssh(self, app_name: str) -> AppStatus:
         """Get app status via SSH (slower)."""
-        output = await self.run(f"ps:report {app_name}")
-
-        if "running" in output.lower():
-            return AppStatus.RUNNING
-        if "stopped" in output.lower():
-            return AppStatus.STOPPED
-        if "crashed" in output.lower() or "exited" in output.lower():
-            return AppStatus.CRASHED
-        return AppStatus.UNKNOWN
+        output = await self.run(f"ps:report {shlex.quote(app_name)}")
+        return self._parse_status(self._report_to_dict(output))
 
     async def app_info(self, app_name: str) -> App:
-        """Get full app information."""
+        """Get full app information (concurrent calls for one app share a fetch)."""
+        return await self._cache.singleflight(("app_info", app_name), self._fetch_app_info, app_name)
+
+    async def _fetch_app_info(self, app_name: str) -> App:
+        """Fetch app info from Docker or SSH."""
         if self.use_docker:
             return await self._app_info_docker(app_name)
         return await self._app_info_ssh(app_name)
 
     async def _app_info_docker(self, app_name: str) -> App:
         """Get app info from Docker/filesystem - fast."""
-        import os
-        
-        # Get status from Docker
-        status = await self._app_status_docker(app_name)
-        
-        # Read domains from VHOST
-        domains = []
-        vhost_path = f"/home/dokku/{app_name}/VHOST"
-        try:
-            with open(vhost_path, "r") as f:
-                domains = [line.strip() for line in f if line.strip()]
-        except (FileNotFoundError, OSError):
-            pass
-        
-        # Count containers
-        proc = await asyncio.create_subprocess_exec(
-            "docker", "ps", "-q",
-            "--filter", f"label=com.dokku.app-name={app_name}",
-            stdout=asyncio.subprocess.PIPE,
+        # `docker ps` and the VHOST read are independent - run them together
+        ps_result, domains = await asyncio.gather(
+            self._ps_report_docker(app_name),
+            asyncio.to_thread(self._read_vhost, app_name),
+            return_exceptions=True,
         )
-        stdout, _ = await proc.communicate()
-        container_count = len([line for line in stdout.decode().strip().split("\n") if line])
+        if isinstance(ps_result, BaseException):
+            ps_result = (AppStatus.UNKNOWN, 0)
+        if isinstance(domains, BaseException):
+            domains = []
+        status, container_count = ps_result
         
         return App(
             name=app_name,
@@ -144,303 +498,424 @@ class DokkuClient:
             web_url=f"https://{domains[0]}" if domains else "",
         )
 
-    async def _app_info_ssh(self, app_name: str) -> App:
-        """Get app info via SSH (slower)."""
-        # Get status
-        status = await self.app_status(app_name)
+    def _read_vhosts(self, app_names: list[str]) -> list[list[str]]:
+        """Read many apps' VHOST files in one go (blocking - run in a thread)."""
+        return [self._read_vhost(name) for name in app_names]
 
-        # Get domains
-        domains_output = await self.run(f"domains:report {app_name}")
-        domains = self._parse_domains(domains_output)
+    def _read_vhost(self, app_name: str) -> list[str]:
+        """Read an app's domains from its VHOST file."""
+        try:
+            return self._read_file_cached(f"/home/dokku/{app_name}/VHOST", self._parse_vhost)
+        except OSError:
+            return []
 
-        # Get container count
-        ps_output = await self.run(f"ps:report {app_name}")
-        container_count = self._parse_container_count(ps_output)
+    def _parse_vhost(self, f) -> list[str]:
+        """Parse a VHOST file: one domain per line."""
+        return [line.strip() for line in f if line.strip()]
 
-        # Get deploy source
-        git_output = await self.run(f"git:report {app_name}")
-        deploy_source = self._parse_deploy_source(git_output)
+    def _read_file_cached(self, path: str, parse):
+        """Return parse(open file), re-reading only when the file's mtime changes.
 
-        return App(
-            name=app_name,
-            status=status,
-            container_count=container_count,
-            domains=domains,
-            deploy_source=deploy_source,
-            web_url=f"https://{domains[0]}" if domains else "",
-        )
+        Steady-state polling costs one stat() per file; entries still expire
+        after a minute in case an edit keeps the same mtime.
+        """
+        mtime = os.stat(path).st_mtime_ns
+        entry = self._file_cache.get(path)
+        now = time.monotonic()
+        if entry is not None and entry[0] == mtime and entry[1] > now:
+            return entry[2]
+        with open(path, "r") as f:
+            value = parse(f)
+        self._file_cache[path] = (mtime, now + 60, value)
+        return value
+
+    async def _app_info_ssh(self, app_name: str) -> App:
+        """Get app info via SSH - one `report` call instead of one per plugin."""
+        output = await self.run(f"report {shlex.quote(app_name)}", timeout=60)
+        return self._app_from_report(app_name, self._split_report(output).get(app_name, {}))
 
     async def get_all_apps(self) -> list[App]:
         """Get all apps with status - uses Docker socket if available."""
         if self.use_docker:
-            return await self._get_apps_from_docker()
-        return await self._get_apps_from_ssh()
+            # Cheap, but polled constantly - collapse refresh storms
+            return await self._cache.cached(("all_apps",), 2, self._get_apps_from_docker)
+        # The bulk `report` is expensive server-side, so reuse it briefly
+        apps = await self._cache.cached(("all_apps",), 15, self._get_apps_from_ssh)
+        if apps is None:
+            # No report (timed out): list names only, and retry the report next poll
+            apps = [
+                App(name=name, web_url=DEFAULT_URL.format(name))
+                for name in await self.apps_list()
+            ]
+        return apps
+
+    async def _scan_app_dirs(self) -> dict[str, list[str]] | None:
+        """Map app directories to their domains, remembering a missing /home/dokku for a minute."""
+        if time.monotonic() < self._home_missing_until:
+            return None
+        apps = await asyncio.to_thread(self._scan_apps_on_disk)
+        if apps is None:
+            # e.g. a dev machine with Docker but no Dokku install
+            self._home_missing_until = time.monotonic() + 60
+        return apps
+
+    def _scan_apps_on_disk(self) -> dict[str, list[str]] | None:
+        """List app directories and read their VHOST files (blocking - run in a thread)."""
+        names = _scan_home("/home/dokku", SKIP_DIRS)
+        if names is None:
+            return None
+        return dict(zip(names, self._read_vhosts(names)))
 
     async def _get_apps_from_docker(self) -> list[App]:
         """Get apps directly from Docker - instant!"""
-        import json
-        import os
-        
-        # Get all Dokku containers with their states
-        proc = await asyncio.create_subprocess_exec(
-            "docker", "ps", "-a",
-            "--filter", "label=com.dokku.app-name",
-            "--format", '{"name":"{{.Label "com.dokku.app-name"}}","state":"{{.State}}","status":"{{.Status}}"}',
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        # Get all Dokku containers with their states, and all app directories
+        # (including apps with no containers) with their VHOST domains, while
+        # the API call is in flight
+        containers, app_domains = await asyncio.gather(
+            self._dokku_containers(),
+            self._scan_app_dirs(),
         )
-        stdout, _ = await proc.communicate()
         
         # Parse container info
         app_status = {}  # app_name -> state
-        for line in stdout.decode().strip().split("\n"):
-            if line:
-                try:
-                    data = json.loads(line)
-                    name = data["name"]
-                    state = data["state"].lower()
-                    status_text = data["status"].lower()
-                    
-                    # Detect transitional states
-                    if "restarting" in state or "restarting" in status_text:
-                        state = "restarting"
-                    elif state == "created":
-                        state = "starting"
-                    
-                    # Priority: restarting > starting > running > exited
-                    if name not in app_status:
-                        app_status[name] = state
-                    elif state == "restarting":
-                        app_status[name] = state
-                    elif state == "starting" and app_status[name] not in ["restarting"]:
-                        app_status[name] = state
-                    elif state == "running" and app_status[name] not in ["restarting", "starting"]:
-                        app_status[name] = state
-                except json.JSONDecodeError:
-                    continue
+        for container in containers:
+            name = container["Labels"]["com.dokku.app-name"]
+            state = container["State"].lower()
+            status_text = container["Status"].lower()
+            
+            # Detect transitional states
+            if "restarting" in state or "restarting" in status_text:
+                state = "restarting"
+            elif state == "created":
+                state = "starting"
+            
+            # Priority: restarting > starting > running > exited
+            if name not in app_status:
+                app_status[name] = state
+            elif state == "restarting":
+                app_status[name] = state
+            elif state == "starting" and app_status[name] not in ["restarting"]:
+                app_status[name] = state
+            elif state == "running" and app_status[name] not in ["restarting", "starting"]:
+                app_status[name] = state
         
-        # Get all app directories (including apps with no containers)
-        skip_dirs = {"ENV", "VHOST", "tls", "dokkurc", ".basher", ".cache", ".config", ".ssh", ".local"}
+        if app_domains is None:
+            # No dokku home: fall back to the apps known from container labels
+            app_domains = {name: [] for name in app_status}
         
         apps = []
-        try:
-            all_dirs = os.listdir("/home/dokku")
-        except OSError:
-            all_dirs = []
-        
-        for name in all_dirs:
-            # Skip non-app directories
-            if name.startswith(".") or name in skip_dirs:
-                continue
-            
-            # Get status
-            status_str = app_status.get(name, "stopped")
-            if status_str == "running":
-                status = AppStatus.RUNNING
-            elif status_str == "restarting":
-                status = AppStatus.RESTARTING
-            elif status_str == "starting":
-                status = AppStatus.STARTING
-            elif status_str in ("exited", "dead", "stopped"):
-                status = AppStatus.STOPPED
-            else:
-                status = AppStatus.UNKNOWN
-            
-            # Read real domain from VHOST file
-            domains = []
-            vhost_path = f"/home/dokku/{name}/VHOST"
-            try:
-                with open(vhost_path, "r") as f:
-                    domains = [line.strip() for line in f if line.strip()]
-            except (FileNotFoundError, OSError):
-                pass
-            
-            web_url = f"https://{domains[0]}" if domains else ""
-            
+        for name, domains in app_domains.items():
             apps.append(App(
                 name=name,
-                status=status,
+                status=DOCKER_STATE_STATUS.get(app_status.get(name, "stopped"), AppStatus.UNKNOWN),
                 domains=domains,
-                web_url=web_url,
+                web_url=f"https://{domains[0]}" if domains else "",
             ))
         
-        return sorted(apps, key=lambda a: a.name)
+        apps.sort(key=lambda a: a.name)
+        return apps
+
+    async def _get_apps_from_ssh(self) -> list[App] | None:
+        """Fallback: Get apps via SSH - `report` without an app covers all apps at once.
 
-    async def _get_apps_from_ssh(self) -> list[App]:
-        """Fallback: Get apps via SSH (slower)."""
-        output = await self.run_fast("apps:list", timeout=10)
+        Returns None when the report came back empty (run_fast timed out or failed).
+        """
+        output = await self.run_fast("report", timeout=60)
+        reports = self._split_report(output)
+        if not reports:
+            return None
         
+        apps = [
+            self._app_from_report(name, sections, default_url=DEFAULT_URL.format(name))
+            for name, sections in reports.items()
+        ]
+        return sorted(apps, key=lambda a: a.name)
+
+    def all_apps_cached(self) -> bool:
+        """Whether get_all_apps would answer from the cache right now."""
+        return self._cache.peek(("all_apps",)) is not None
+
+    async def stream_apps(self) -> AsyncIterator[App]:
+        """Yield apps as each one's info arrives, for progressive rendering.
+
+        Docker mode and a warm cache yield get_all_apps() as-is. Over SSH each
+        app's report runs concurrently and is yielded as soon as it completes;
+        an app whose report fails comes through with UNKNOWN status. A pass
+        with no failures is cached for get_all_apps.
+        """
+        if self.use_docker or self.all_apps_cached():
+            for app in await self.get_all_apps():
+                yield app
+            return
+
+        generation = self._cache.generation(("all_apps",))
+        tasks = [asyncio.create_task(self._streamed_app(name)) for name in await self.apps_list()]
         apps = []
-        lines = output.strip().split("\n")
-        
-        # Skip header line "=====> My Apps"
-        for line in lines[1:]:
-            name = line.strip()
-            if name:
-                apps.append(App(
-                    name=name,
-                    status=AppStatus.UNKNOWN,
-                    web_url=f"https://{name}.brewbytes.dev",
-                ))
-        
-        return apps
+        complete = True
+        try:
+            for next_app in asyncio.as_completed(tasks):
+                app = await next_app
+                complete = complete and app.status != AppStatus.UNKNOWN
+                apps.append(app)
+                yield app
+        finally:
+            # Client went away mid-stream - don't leave reports running
+            for task in tasks:
+                task.cancel()
+        # A partial pass isn't cached - the next poll runs the bulk report instead
+        if apps and complete:
+            self._cache.store(("all_apps",), 15, sorted(apps, key=lambda a: a.name), generation)
+
+    async def _streamed_app(self, app_name: str) -> App:
+        """One app for stream_apps, with UNKNOWN status if its report fails."""
+        try:
+            output = await self.run(f"report {shlex.quote(app_name)}", timeout=60)
+        except Exception:
+            return App(name=app_name, web_url=DEFAULT_URL.format(app_name))
+        sections = self._split_report(output).get(app_name, {})
+        return self._app_from_report(app_name, sections, default_url=DEFAULT_URL.format(app_name))
 
     async def app_start(self, app_name: str) -> str:
         """Start an app."""
-        if self.use_docker:
-            return await self._app_start_docker(app_name)
-        return await self.run(f"ps:start {app_name}", timeout=60)
+        try:
+            if self.use_docker:
+                return await self._app_start_docker(app_name)
+            return await self.run(f"ps:start {shlex.quote(app_name)}", timeout=60)
+        finally:
+            self._invalidate(app_name)
 
     async def app_stop(self, app_name: str) -> str:
         """Stop an app."""
-        if self.use_docker:
-            return await self._app_stop_docker(app_name)
-        return await self.run(f"ps:stop {app_name}", timeout=60)
+        try:
+            if self.use_docker:
+                return await self._app_stop_docker(app_name)
+            return await self.run(f"ps:stop {shlex.quote(app_name)}", timeout=60)
+        finally:
+            self._invalidate(app_name)
 
     async def app_restart(self, app_name: str) -> str:
         """Restart an app."""
-        if self.use_docker:
-            return await self._app_restart_docker(app_name)
-        return await self.run(f"ps:restart {app_name}", timeout=120)
+        try:
+            if self.use_docker:
+                return await self._app_restart_docker(app_name)
+            return await self.run(f"ps:restart {shlex.quote(app_name)}", timeout=120)
+        finally:
+            self._invalidate(app_name)
 
     async def app_rebuild(self, app_name: str) -> str:
         """Rebuild an app."""
-        if self.use_docker:
-            return await self._app_rebuild_docker(app_name)
-        return await self.run(f"ps:rebuild {app_name}", timeout=300)
+        try:
+            if self.use_docker:
+                return await self._app_rebuild_docker(app_name)
+            return await self.run(f"ps:rebuild {shlex.quote(app_name)}", timeout=300)
+        finally:
+            self._invalidate(app_name)
 
     async def _app_start_docker(self, app_name: str) -> str:
         """Start app containers directly."""
-        proc = await asyncio.create_subprocess_exec(
-            "docker", "start",
-            *await self._get_container_names(app_name),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await proc.communicate()
-        return stdout.decode() or stderr.decode()
+        return await self._container_action(app_name, "start")
 
     async def _app_stop_docker(self, app_name: str) -> str:
         """Stop app containers directly."""
-        proc = await asyncio.create_subprocess_exec(
-            "docker", "stop",
-            *await self._get_container_names(app_name),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await proc.communicate()
-        return stdout.decode() or stderr.decode()
+        return await self._container_action(app_name, "stop")
 
     async def _app_restart_docker(self, app_name: str) -> str:
         """Restart app containers directly."""
-        proc = await asyncio.create_subprocess_exec(
-            "docker", "restart",
-            *await self._get_container_names(app_name),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        return await self._container_action(app_name, "restart")
+
+    async def _container_action(self, app_name: str, action: str) -> str:
+        """POST start/stop/restart to every container of an app via the Docker API."""
+        api = self._docker_api()
+        ids = await self._get_container_names(app_name)
+        responses = await asyncio.gather(
+            *(api.post(f"/containers/{container_id}/{action}") for container_id in ids),
+            return_exceptions=True,
         )
-        stdout, stderr = await proc.communicate()
-        return stdout.decode() or stderr.decode()
+        # One line per container, like the docker CLI: the ID, or the error
+        lines = []
+        for container_id, response in zip(ids, responses):
+            if isinstance(response, httpx.HTTPError):
+                lines.append(f"{container_id[:12]}: {response}")
+            elif isinstance(response, BaseException):
+                raise response
+            elif response.is_error:
+                lines.append(f"{container_id[:12]}: {_docker_error(response)}")
+            else:
+                lines.append(container_id[:12])
+        return "\n".join(lines)
 
     async def _app_rebuild_docker(self, app_name: str) -> str:
         """Rebuild via dokku command directly."""
-        proc = await asyncio.create_subprocess_exec(
-            "dokku", "ps:rebuild", app_name,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=300)
+        stdout, stderr = await self._exec("dokku", "ps:rebuild", app_name, timeout=300)
         return stdout.decode() or stderr.decode()
 
     async def _get_container_names(self, app_name: str) -> list[str]:
-        """Get all container names for an app."""
-        proc = await asyncio.create_subprocess_exec(
-            "docker", "ps", "-aq",
-            "--filter", f"label=com.dokku.app-name={app_name}",
-            stdout=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await proc.communicate()
-        return stdout.decode().strip().split("\n")
+        """Get all container IDs for an app (newest first, like `docker ps -aq`)."""
+        return [
+            container["Id"] for container in await self._dokku_containers()
+            if container["Labels"].get("com.dokku.app-name") == app_name
+        ]
 
     async def config_list(self, app_name: str) -> list[EnvVar]:
-        """Get environment variables for an app."""
+        """Get environment variables for an app (cached for 30s)."""
+        return await self._cache.cached(("config_list", app_name), 30, self._fetch_config_list, app_name)
+
+    async def _fetch_config_list(self, app_name: str) -> list[EnvVar]:
+        """Fetch environment variables from the ENV file or SSH."""
         if self.use_docker:
             return await self._config_list_docker(app_name)
         return await self._config_list_ssh(app_name)
 
     async def _config_list_docker(self, app_name: str) -> list[EnvVar]:
         """Get config from ENV file - instant."""
+        return await asyncio.to_thread(self._read_env, app_name)
+
+    def _read_env(self, app_name: str) -> list[EnvVar]:
+        """Read an app's ENV file (blocking - run in a thread)."""
+        try:
+            return self._read_file_cached(f"/home/dokku/{app_name}/ENV", self._parse_env)
+        except OSError:
+            return []
+
+    def _parse_env(self, f) -> list[EnvVar]:
+        """Parse an ENV file into sorted EnvVars."""
+        text = f.read()
+        try:
+            env = _parse_env_file(text)
+        except ValueError:
+            # Hand-edited file - salvage what parses line by line
+            env = dict(filter(None, map(self._parse_env_line, text.splitlines())))
+
         env_vars = []
-        sensitive_keys = {"password", "secret", "key", "token", "api", "private"}
+        for key, value in env.items():
+            is_sensitive = bool(SENSITIVE_RE.search(key))
+
+            env_vars.append(EnvVar(key=key, value=value, is_sensitive=is_sensitive))
+
+        return sorted(env_vars, key=lambda e: e.key)
+
+    def _parse_env_line(self, line: str) -> tuple[str, str] | None:
+        """Parse one `export KEY='VALUE'` (or KEY=VALUE) line; None for blanks/comments."""
+        line = line.strip()
+        if not line or line.startswith("#"):
+            return None
         
-        env_path = f"/home/dokku/{app_name}/ENV"
+        key, sep, value = line.partition("=")
+        if not sep:
+            return None
+        key = key.strip().removeprefix("export ").strip()
+        value = value.strip()
         try:
-            with open(env_path, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    
-                    # Parse KEY="VALUE" or KEY=VALUE
-                    if "=" in line:
-                        key, _, value = line.partition("=")
-                        key = key.strip()
-                        value = value.strip().strip('"').strip("'")
-                        
-                        # Check if sensitive
-                        is_sensitive = any(s in key.lower() for s in sensitive_keys)
-                        
-                        env_vars.append(EnvVar(key=key, value=value, is_sensitive=is_sensitive))
-        except (FileNotFoundError, OSError):
-            pass
+            # dokku writes shell-quoted values
+            value = "".join(shlex.split(value))
+        except ValueError:
+            value = value.strip('"').strip("'")
+        return key, value
+
+    def _update_env(self, app_name: str, updates: dict[str, str | None]) -> None:
+        """Apply updates (None removes a key) to an app's ENV file atomically (blocking).
+
+        Writes the file the way dokku's config plugin does - keys sorted,
+        `export KEY='value'` - and keeps its owner and mode. Raises
+        FileNotFoundError for an unknown app, other OSErrors when the file
+        can't be rewritten, and ValueError when it doesn't parse cleanly.
+        """
+        app_dir = f"/home/dokku/{app_name}"
+        path = f"{app_dir}/ENV"
+        env: dict[str, str] = {}
+        try:
+            with open(path, "r") as f:
+                env = _parse_env_file(f.read())
+            st = os.stat(path)
+            mode = stat.S_IMODE(st.st_mode)
+        except FileNotFoundError:
+            st = os.stat(app_dir)  # new ENV file belongs to the app dir's owner
+            mode = 0o600
+
+        for key, value in updates.items():
+            if value is None:
+                env.pop(key, None)
+            else:
+                env[key] = value
         
-        return sorted(env_vars, key=lambda e: e.key)
+        fd, tmp_path = tempfile.mkstemp(dir=app_dir, prefix=".ENV.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(_format_env(env))
+            os.chmod(tmp_path, mode)
+            os.chown(tmp_path, st.st_uid, st.st_gid)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
     async def _config_list_ssh(self, app_name: str) -> list[EnvVar]:
         """Get config via SSH (slower)."""
-        output = await self.run(f"config:show {app_name}")
+        output = await self.run(f"config:show {shlex.quote(app_name)}")
         return self._parse_config(output)
 
     async def config_set(self, app_name: str, key: str, value: str, restart: bool = True) -> str:
         """Set an environment variable."""
-        if self.use_docker:
-            return await self._config_set_docker(app_name, key, value, restart)
-        restart_flag = "" if restart else "--no-restart"
-        # Escape value for shell
-        escaped_value = value.replace("'", "'\"'\"'")
-        return await self.run(f"config:set {restart_flag} {app_name} {key}='{escaped_value}'", timeout=120)
+        try:
+            if self.use_docker:
+                return await self._config_set_docker(app_name, key, value, restart)
+            restart_flag = "" if restart else "--no-restart"
+            # dokku word-splits SSH_ORIGINAL_COMMAND; quoting keeps a value with
+            # spaces or quotes as one KEY=value argument
+            return await self.run(
+                f"config:set {restart_flag} {shlex.quote(app_name)} {shlex.quote(f'{key}={value}')}",
+                timeout=120,
+            )
+        finally:
+            self._invalidate(app_name)
 
     async def config_unset(self, app_name: str, key: str, restart: bool = True) -> str:
         """Unset an environment variable."""
-        if self.use_docker:
-            return await self._config_unset_docker(app_name, key, restart)
-        restart_flag = "" if restart else "--no-restart"
-        return await self.run(f"config:unset {restart_flag} {app_name} {key}", timeout=120)
+        try:
+            if self.use_docker:
+                return await self._config_unset_docker(app_name, key, restart)
+            restart_flag = "" if restart else "--no-restart"
+            return await self.run(f"config:unset {restart_flag} {shlex.quote(app_name)} {shlex.quote(key)}", timeout=120)
+        finally:
+            self._invalidate(app_name)
 
     async def _config_set_docker(self, app_name: str, key: str, value: str, restart: bool = True) -> str:
-        """Set config using dokku command directly."""
-        restart_flag = [] if restart else ["--no-restart"]
-        # Escape value for shell
-        escaped_value = value.replace("'", "'\"'\"'")
-        
-        proc = await asyncio.create_subprocess_exec(
-            "dokku", "config:set", *restart_flag, app_name, f"{key}='{escaped_value}'",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=120)
-        return stdout.decode() or stderr.decode()
+        """Set config locally; only --no-restart changes skip dokku."""
+        # One config change per app at a time, so read-modify-write edits don't lose updates
+        async with self._env_locks.setdefault(app_name, asyncio.Lock()):
+            # A restart needs dokku anyway, and config:set also fires its config triggers
+            if not restart and await self._update_env_direct(app_name, key, {key: value}):
+                return ""
+            # No shell involved - the value is passed through verbatim
+            return await self._config_dokku("config:set", app_name, f"{key}={value}", restart=restart)
 
     async def _config_unset_docker(self, app_name: str, key: str, restart: bool = True) -> str:
-        """Unset config using dokku command directly."""
+        """Unset config locally; only --no-restart changes skip dokku."""
+        async with self._env_locks.setdefault(app_name, asyncio.Lock()):
+            if not restart and await self._update_env_direct(app_name, key, {key: None}):
+                return ""
+            return await self._config_dokku("config:unset", app_name, key, restart=restart)
+
+    async def _update_env_direct(self, app_name: str, key: str, updates: dict[str, str | None]) -> bool:
+        """Rewrite the ENV file in place; False if dokku should handle the change instead."""
+        # Anything unusual (odd names, unknown app) goes through dokku and its validation
+        if not (APP_NAME_RE.fullmatch(app_name) and ENV_KEY_RE.fullmatch(key)):
+            return False
+        try:
+            await asyncio.to_thread(self._update_env, app_name, updates)
+        except (OSError, ValueError):
+            # Unknown app, no permission to write as the dokku user, or a file we
+            # can't round-trip safely - dokku knows how to do it
+            return False
+        return True
+
+    async def _config_dokku(self, subcommand: str, app_name: str, *args: str, restart: bool = True) -> str:
+        """Run a dokku config:* command directly."""
         restart_flag = [] if restart else ["--no-restart"]
-        
-        proc = await asyncio.create_subprocess_exec(
-            "dokku", "config:unset", *restart_flag, app_name, key,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        stdout, stderr = await self._exec(
+            "dokku", subcommand, *restart_flag, app_name, *args,
+            timeout=120,
         )
-        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=120)
         return stdout.decode() or stderr.decode()
 
     async def logs_stream(self, app_name: str, lines: int = 100) -> AsyncIterator[str]:
@@ -449,118 +924,170 @@ class DokkuClient:
             async for line in self._logs_stream_docker(app_name, lines):
                 yield line
         else:
-            async with await self._connect() as conn:
-                async with conn.create_process(f"logs {app_name} -t -n {lines}") as proc:
-                    async for line in proc.stdout:
-                        yield line.rstrip("\n")
+            conn = await self._pool.acquire()
+            # Wider window/packets so bursts of log output need fewer flow-control round trips
+            async with conn.create_process(
+                f"logs {shlex.quote(app_name)} -t -n {lines}",
+                encoding=None,
+                window=4 * 1024 * 1024,
+                max_pktsize=64 * 1024,
+            ) as proc:
+                async for line in self._read_lines(proc.stdout):
+                    yield line
 
     async def _logs_stream_docker(self, app_name: str, lines: int = 100) -> AsyncIterator[str]:
         """Stream logs directly from Docker."""
         containers = await self._get_container_names(app_name)
-        if not containers or not containers[0]:
+        if not containers:
             return
         
-        # Stream from first web container
-        proc = await asyncio.create_subprocess_exec(
-            "docker", "logs", "-f", "-n", str(lines), "-t", containers[0],
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.STDOUT,
-        )
-        
-        while True:
-            line = await proc.stdout.readline()
-            if not line:
-                break
-            yield line.decode().rstrip("\n")
+        # Stream from first web container; a followed stream idles, so no read timeout
+        async with self._docker_api().stream(
+            "GET",
+            f"/containers/{containers[0]}/logs",
+            params=self._docker_log_params(lines, follow=True),
+            timeout=httpx.Timeout(30, read=None),
+        ) as response:
+            if response.is_error:
+                # The body is a JSON error message, not framed log data
+                await response.aread()
+                yield f"Could not fetch logs: {_docker_error(response)}"
+                return
+            async for line in self._iter_lines(_demux_docker_log(response.aiter_bytes())):
+                yield line
+
+    def _docker_log_params(self, lines: int, follow: bool = False) -> dict[str, str]:
+        """Query for /containers/{id}/logs matching `docker logs -t -n N 2>&1`."""
+        params = {"stdout": "true", "stderr": "true", "timestamps": "true", "tail": str(lines)}
+        if follow:
+            params["follow"] = "true"
+        return params
+
+    async def _read_lines(self, stream, chunk_size: int = 64 * 1024) -> AsyncIterator[str]:
+        """Yield lines from a byte stream, reading it in large chunks."""
+        async def chunks():
+            while chunk := await stream.read(chunk_size):
+                yield chunk
+
+        async for line in self._iter_lines(chunks()):
+            yield line
+
+    async def _iter_lines(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+        """Split an async stream of byte chunks into decoded lines."""
+        pending = b""
+        async for chunk in chunks:
+            *complete, pending = (pending + chunk).split(b"\n")
+            for line in complete:
+                yield line.decode(errors="replace")
+        if pending:
+            yield pending.decode(errors="replace")
 
     async def logs_recent(self, app_name: str, lines: int = 100) -> str:
         """Get recent logs."""
         if self.use_docker:
             return await self._logs_recent_docker(app_name, lines)
-        return await self.run(f"logs {app_name} -n {lines}")
+        return await self.run(f"logs {shlex.quote(app_name)} -n {lines}")
 
     async def _logs_recent_docker(self, app_name: str, lines: int = 100) -> str:
         """Get recent logs directly from Docker."""
         containers = await self._get_container_names(app_name)
-        if not containers or not containers[0]:
+        if not containers:
             return "No containers found"
         
-        proc = await asyncio.create_subprocess_exec(
-            "docker", "logs", "-n", str(lines), "-t", containers[0],
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.STDOUT,
-        )
-        stdout, _ = await proc.communicate()
-        return stdout.decode()
+        try:
+            async with self._docker_api().stream(
+                "GET", f"/containers/{containers[0]}/logs", params=self._docker_log_params(lines)
+            ) as response:
+                if response.is_error:
+                    # The body is a JSON error message, not framed log data
+                    await response.aread()
+                    return f"Could not fetch logs: {_docker_error(response)}"
+                output = [chunk async for chunk in _demux_docker_log(response.aiter_bytes())]
+        except httpx.HTTPError as e:
+            return f"Could not fetch logs: {e}"
+        return b"".join(output).decode(errors="replace")
 
     # Parser methods
-    def _parse_domains(self, output: str) -> list[str]:
-        """Parse domains from domains:report output."""
-        domains = []
-        for line in output.split("\n"):
-            if "Domains app vhosts:" in line:
-                # Extract domains after the colon
-                parts = line.split(":", 1)
-                if len(parts) > 1:
-                    domain_str = parts[1].strip()
-                    domains = [d.strip() for d in domain_str.split() if d.strip()]
-        return domains
-
-    def _parse_container_count(self, output: str) -> int:
-        """Parse container count from ps:report output."""
-        for line in output.split("\n"):
-            if "Processes:" in line or "Running:" in line:
-                match = re.search(r"(\d+)", line)
-                if match:
-                    return int(match.group(1))
-        return 0
-
-    def _parse_deploy_source(self, output: str) -> str:
-        """Parse deploy source from git:report output."""
-        for line in output.split("\n"):
-            if "Git deploy branch:" in line:
-                parts = line.split(":", 1)
-                if len(parts) > 1:
-                    return parts[1].strip()
-        return "unknown"
+    def _split_report(self, output: str) -> dict[str, dict[str, str]]:
+        """Split `dokku report` output into {app: {plugin: section}}."""
+        reports: dict[str, dict[str, str]] = {}
+        headers = list(REPORT_HEADER_RE.finditer(output))
+        for i, header in enumerate(headers):
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(output)
+            app, plugin = header.group(1), header.group(2)
+            reports.setdefault(app, {})[plugin] = output[header.end():end]
+        return reports
 
-    def _parse_config(self, output: str) -> list[EnvVar]:
-        """Parse environment variables from config:show output."""
-        env_vars = []
-        sensitive_keys = {"password", "secret", "key", "token", "api", "private"}
+    def _app_from_report(self, app_name: str, sections: dict[str, str], default_url: str = "") -> App:
+        """Build an App from its `dokku report` sections."""
+        fields = self._report_to_dict("".join(sections.values()))
+        domains = self._parse_domains(fields)
+        return App(
+            name=app_name,
+            status=self._parse_status(self._report_to_dict(sections.get("ps", ""))),
+            container_count=self._parse_container_count(fields),
+            domains=domains,
+            deploy_source=self._parse_deploy_source(fields),
+            web_url=f"https://{domains[0]}" if domains else default_url,
+        )
 
-        for line in output.split("\n"):
-            if ":" in line and not line.startswith("="):
-                # Split on first colon only
-                parts = line.split(":", 1)
-                if len(parts) == 2:
-                    key = parts[0].strip()
-                    value = parts[1].strip()
+    def _parse_status(self, fields: dict[str, str]) -> AppStatus:
+        """Parse app status from ps:report fields."""
+        # "Status web 1:  running (CID: 03ea8977f37)" - one per process, first word is the state
+        states = [
+            value.split(maxsplit=1)[0].lower()
+            for key, value in fields.items()
+            if key.startswith("Status ") and value
+        ]
+        if "restarting" in states:
+            return AppStatus.RESTARTING
+        status = PS_RUNNING_STATUS.get(fields.get("Running", "").lower())
+        if status is not None:
+            return status
+        # Older dokku without the Running field
+        if not states:
+            return AppStatus.UNKNOWN
+        return AppStatus.RUNNING if "running" in states else AppStatus.STOPPED
 
-                    # Skip header lines
-                    if key.startswith("===="):
-                        continue
+    def _report_to_dict(self, output: str) -> dict[str, str]:
+        """Parse "Label:   value" report lines into a dict in one pass."""
+        fields = {}
+        for line in output.splitlines():
+            key, sep, value = line.partition(":")
+            if sep and not key.startswith("="):
+                fields[key.strip()] = value.strip()
+        return fields
 
-                    # Check if sensitive
-                    is_sensitive = any(s in key.lower() for s in sensitive_keys)
+    def _parse_domains(self, fields: dict[str, str]) -> list[str]:
+        """Parse domains from domains:report fields."""
+        return fields.get("Domains app vhosts", "").split()
 
-                    env_vars.append(EnvVar(key=key, value=value, is_sensitive=is_sensitive))
+    def _parse_container_count(self, fields: dict[str, str]) -> int:
+        """Parse container count from ps:report fields."""
+        match = NUM_RE.search(fields.get("Processes", ""))
+        return int(match.group()) if match else 0
 
-        return env_vars
+    def _parse_deploy_source(self, fields: dict[str, str]) -> str:
+        """Parse deploy source from git:report fields."""
+        return fields.get("Git deploy branch", "unknown")
+
+    def _parse_config(self, output: str) -> list[EnvVar]:
+        """Parse environment variables from config:show output."""
+        return [
+            EnvVar(key=key.strip(), value=value.strip(), is_sensitive=bool(SENSITIVE_RE.search(key)))
+            for key, value in CONFIG_LINE_RE.findall(output)
+        ]
 
     async def get_app_scaling(self, app_name: str) -> dict:
         """Get app scaling information."""
-        from app.dokku.models import ProcessScale
-        
-        proc = await asyncio.create_subprocess_exec(
-            "dokku", "ps:scale", app_name,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await proc.communicate()
+        return await self._cache.singleflight(("scaling", app_name), self._fetch_app_scaling, app_name)
+
+    async def _fetch_app_scaling(self, app_name: str) -> dict:
+        """Fetch process scaling from ps:scale."""
+        stdout, _ = await self._exec("dokku", "ps:scale", app_name)
         
         processes = []
-        for line in stdout.decode().strip().split("\n"):
+        for line in stdout.decode().splitlines():
             if ":" in line and not line.startswith("---") and not line.startswith("==="):
                 parts = line.split(":")
                 if len(parts) == 2:
@@ -576,113 +1103,104 @@ class DokkuClient:
         
         return {"processes": processes}
 
+    async def _app_report(self, app_name: str) -> dict[str, str]:
+        """Get an app's `dokku report` sections keyed by plugin.
+
+        One subprocess covers the network, proxy, storage and checks reports,
+        and concurrent callers for the same app share it.
+        """
+        return await self._cache.singleflight(("report", app_name), self._fetch_app_report, app_name)
+
+    async def _fetch_app_report(self, app_name: str) -> dict[str, str]:
+        """Run `dokku report` for one app and split it by plugin."""
+        output = await self._dokku_local("report", app_name)
+        return self._split_report(output).get(app_name, {})
+
     async def get_app_network_config(self, app_name: str) -> dict:
         """Get app network configuration."""
-        proc = await asyncio.create_subprocess_exec(
-            "dokku", "network:report", app_name,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await proc.communicate()
+        sections = await self._app_report(app_name)
         
-        config = {
-            "attached_networks": [],
-            "bind_all_interfaces": False,
-            "initial_network": "",
+        fields = self._report_to_dict(sections.get("network", ""))
+        return {
+            "attached_networks": fields.get("Network attach post deploy", "").split(),
+            "bind_all_interfaces": "true" in fields.get("Network bind all interfaces", "").lower(),
+            "initial_network": fields.get("Network initial network", ""),
+            "port_mappings": self._report_to_dict(sections.get("proxy", "")).get("Proxy port map", "").split(),
         }
-        
-        for line in stdout.decode().strip().split("\n"):
-            if "Network attach post deploy:" in line:
-                networks = line.split(":", 1)[1].strip()
-                if networks:
-                    config["attached_networks"] = networks.split()
-            elif "Network bind all interfaces:" in line:
-                config["bind_all_interfaces"] = "true" in line.lower()
-            elif "Network initial network:" in line:
-                config["initial_network"] = line.split(":", 1)[1].strip()
-        
-        # Get port mappings from proxy:report
-        proc = await asyncio.create_subprocess_exec(
-            "dokku", "proxy:report", app_name,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await proc.communicate()
-        
-        port_map = []
-        for line in stdout.decode().strip().split("\n"):
-            if "Proxy port map:" in line:
-                ports = line.split(":", 1)[1].strip()
-                if ports:
-                    port_map = ports.split()
-        
-        config["port_mappings"] = port_map
-        
-        return config
+
+    async def _dokku_local(self, *args: str) -> str:
+        """Run the local dokku binary and return its decoded stdout."""
+        stdout, _ = await self._exec("dokku", *args)
+        return stdout.decode()
 
     async def get_app_storage_mounts(self, app_name: str) -> list[dict]:
         """Get app storage mounts."""
-        proc = await asyncio.create_subprocess_exec(
-            "dokku", "storage:report", app_name,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await proc.communicate()
+        sections = await self._app_report(app_name)
         
+        fields = self._report_to_dict(sections.get("storage", ""))
         mounts = []
-        for line in stdout.decode().strip().split("\n"):
-            if ("Storage build mounts:" in line or 
-                "Storage deploy mounts:" in line or 
-                "Storage run mounts:" in line):
-                mount_info = line.split(":", 1)[1].strip()
-                if mount_info and mount_info != "none":
-                    for mount in mount_info.split():
-                        if ":" in mount:
-                            host, container = mount.split(":", 1)
-                            mounts.append({
-                                "host_path": host,
-                                "container_path": container,
-                                "type": "bind" if not host.startswith("/") else "volume"
-                            })
+        for label in ("Storage build mounts", "Storage deploy mounts", "Storage run mounts"):
+            mount_info = fields.get(label, "")
+            if mount_info and mount_info != "none":
+                for mount in mount_info.split():
+                    if ":" in mount:
+                        host, container = mount.split(":", 1)
+                        mounts.append({
+                            "host_path": host,
+                            "container_path": container,
+                            "type": "bind" if not host.startswith("/") else "volume"
+                        })
         
         return mounts
 
     async def get_app_ssl_status(self, app_name: str) -> dict:
         """Get app SSL certificate status."""
-        proc = await asyncio.create_subprocess_exec(
-            "dokku", "letsencrypt:list",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await proc.communicate()
-        
-        for line in stdout.decode().strip().split("\n"):
-            if line.strip().startswith(app_name):
-                parts = line.split()
-                if len(parts) >= 4:
-                    try:
-                        expiry_str = " ".join(parts[1:3])
-                        days_str = parts[3].split("d,")[0] if "d," in parts[3] else "0"
-                        days_until_expiry = int(days_str)
-                        
-                        return {
-                            "enabled": True,
-                            "expiry_date": expiry_str,
-                            "days_until_expiry": days_until_expiry,
-                        }
-                    except (ValueError, IndexError):
-                        pass
-        
+        for cert in await self.ssl_certificates():
+            if cert.app_name == app_name:
+                return {
+                    "enabled": True,
+                    "expiry_date": cert.expiry_date,
+                    "days_until_expiry": cert.days_until_expiry,
+                }
         return {"enabled": False}
 
+    async def ssl_certificates(self) -> list[SSLCertificate]:
+        """Get every app's letsencrypt certificate (shared, cached for a minute).
+
+        Issuing or renewing touches the letsencrypt dir, so a changed mtime
+        re-reads right away; the TTL catches in-place edits.
+        """
+        fetched_mtime, certificates = await self._cache.cached(("letsencrypt_list",), 60, self._ssl_snapshot)
+        if fetched_mtime != _letsencrypt_mtime():
+            self._cache.invalidate(("letsencrypt_list",))
+            _, certificates = await self._cache.cached(("letsencrypt_list",), 60, self._ssl_snapshot)
+        return certificates
+
+    async def _ssl_snapshot(self) -> tuple[int | None, list[SSLCertificate]]:
+        """Get the certificates along with the letsencrypt dir mtime they reflect."""
+        # stat first: a change during the listing then forces the next re-read
+        mtime = _letsencrypt_mtime()
+        return mtime, await self._fetch_ssl_certificates()
+
+    async def _fetch_ssl_certificates(self) -> list[SSLCertificate]:
+        """Run letsencrypt:list and parse its rows."""
+        stdout, _ = await self._exec("dokku", "letsencrypt:list", timeout=30)
+        # Header and separator rows simply don't match; under a day left there is
+        # no "Nd," part. Renewal is typically 30 days before expiry.
+        return [
+            SSLCertificate(
+                app_name=match[1].decode(),
+                expiry_date=match[2].decode(),
+                days_until_expiry=(days := int(match[3] or 0)),
+                days_until_renewal=max(0, days - 30),
+                auto_renew=True,  # Assume auto-renew is enabled
+            )
+            for match in SSL_ROW_RE.finditer(stdout)
+        ]
+
     async def get_app_health_checks(self, app_name: str) -> dict:
         """Get app health check configuration."""
-        proc = await asyncio.create_subprocess_exec(
-            "dokku", "checks:report", app_name,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await proc.communicate()
+        sections = await self._app_report(app_name)
         
         config = {
             "disabled": [],
@@ -690,21 +1208,22 @@ class DokkuClient:
             "wait_to_retire": 60,
         }
         
-        for line in stdout.decode().strip().split("\n"):
-            if "Checks disabled list:" in line:
-                disabled = line.split(":", 1)[1].strip()
-                if disabled and disabled != "none":
-                    config["disabled"] = disabled.split()
-            elif "Checks skipped list:" in line:
-                skipped = line.split(":", 1)[1].strip()
-                if skipped and skipped != "none":
-                    config["skipped"] = skipped.split()
-            elif "wait to retire:" in line.lower():
+        fields = self._report_to_dict(sections.get("checks", ""))
+        for key, target in (("Checks disabled list", "disabled"), ("Checks skipped list", "skipped")):
+            value = fields.get(key, "")
+            if value and value != "none":
+                config[target] = value.split()
+        for key, value in fields.items():
+            if key.lower().endswith("wait to retire"):
                 try:
-                    wait = line.split(":", 1)[1].strip()
-                    config["wait_to_retire"] = int(wait)
+                    config["wait_to_retire"] = int(value)
                 except ValueError:
                     pass
         
         return config
 
+
+@lru_cache
+def get_client() -> DokkuClient:
+    """Get the shared client instance (one SSH connection per process)."""
+    return DokkuClient()
@@ -1,9 +1,15 @@
 """Dokku data models."""
 
+from bisect import bisect_left
 from dataclasses import dataclass, field
 from enum import Enum
 
 
+# Days-until-expiry thresholds and the colors for the bands between them
+SSL_EXPIRY_THRESHOLDS = (7, 30, 60)
+SSL_EXPIRY_COLORS = ("red", "orange", "yellow", "green")
+
+
 class AppStatus(str, Enum):
     """Application status."""
 
@@ -16,7 +22,7 @@ class AppStatus(str, Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class App:
     """Dokku application."""
 
@@ -34,7 +40,7 @@ class App:
         return self.domains[0] if self.domains else None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EnvVar:
     """Environment variable."""
 
@@ -50,7 +56,7 @@ class EnvVar:
         return self.value
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Service:
     """Dokku service (Redis, Postgres, MySQL, etc)."""
 
@@ -74,7 +80,7 @@ class Service:
         return "••••••••"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SSLCertificate:
     """SSL certificate information."""
 
@@ -87,16 +93,11 @@ class SSLCertificate:
     @property
     def status_color(self) -> str:
         """Get color based on days until expiry."""
-        if self.days_until_expiry > 60:
-            return "green"
-        elif self.days_until_expiry > 30:
-            return "yellow"
-        elif self.days_until_expiry > 7:
-            return "orange"
-        return "red"
+        # > 60 green, > 30 yellow, > 7 orange, else red
+        return SSL_EXPIRY_COLORS[bisect_left(SSL_EXPIRY_THRESHOLDS, self.days_until_expiry)]
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessScale:
     """Process scaling information."""
 
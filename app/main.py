@@ -1,20 +1,46 @@
 """Dokku Dashboard - Main application."""
 
-from fastapi import FastAPI, Request
+import asyncio
+import json
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 
 from app.auth import get_current_user
 from app.config import get_settings
+from app.dokku import get_client
 from app.routers import apps, config, logs, system, plugins, services, ssl
+from app.staticfiles import CachedStaticFiles
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Keep one Dokku client (and its SSH connection) for the process lifetime."""
+    client = get_client()
+    # Connect in the background so an unreachable host can't hold up startup
+    # (or /health); system stats are likewise refreshed off the request path
+    # while /system is being viewed
+    tasks = [
+        asyncio.create_task(client.warm_up()),
+        asyncio.create_task(system.refresh_system_stats(app.state)),
+    ]
+    yield
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+    await client.close()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Dokku Dashboard",
     description="Web UI for managing Dokku applications",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -27,7 +53,7 @@ app.add_middleware(
 )
 
 # Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
 
 # Include routers
 app.include_router(apps.router)
@@ -38,9 +64,6 @@ app.include_router(ssl.router)
 app.include_router(system.router)
 app.include_router(plugins.router)
 
-# Templates
-templates = Jinja2Templates(directory="app/templates")
-
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -48,15 +71,23 @@ async def home(request: Request):
     return RedirectResponse(url="/apps", status_code=302)
 
 
+# Constant for the process lifetime, so encode it once
+HEALTH_BODY = json.dumps({"status": "healthy", "app": get_settings().app_name}).encode()
+
+
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    return {"status": "healthy", "app": get_settings().app_name}
+    return Response(HEALTH_BODY, media_type="application/json")
 
 
 @app.middleware("http")
 async def add_user_to_request(request: Request, call_next):
     """Add user info to request state."""
+    # Assets and liveness probes never render a user
+    path = request.scope["path"]
+    if path.startswith("/static/") or path == "/health":
+        return await call_next(request)
     request.state.user = get_current_user(request)
     response = await call_next(request)
     return response
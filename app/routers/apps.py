@@ -1,34 +1,71 @@
 """App management routes."""
 
+import asyncio
+import logging
+
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from sse_starlette.sse import EventSourceResponse
 
-from app.dokku import DokkuClient
+from app.dokku import App, AppStatus, get_client
+from app.templating import templates, with_etag
 
 router = APIRouter(prefix="/apps", tags=["apps"])
-templates = Jinja2Templates(directory="app/templates")
+logger = logging.getLogger(__name__)
+
+# Status badge HTML, rendered once per status
+STATUS_COLORS = {
+    AppStatus.RUNNING: "bg-green-500",
+    AppStatus.STOPPED: "bg-red-500",
+    AppStatus.CRASHED: "bg-orange-500",
+}
+STATUS_BADGES = {
+    status: (
+        f'<span class="px-2 py-1 text-xs font-medium text-white rounded-full '
+        f'{STATUS_COLORS.get(status, "bg-gray-500")}">{status.value}</span>'
+    )
+    for status in AppStatus
+}
 
 
 @router.get("", response_class=HTMLResponse)
 async def list_apps(request: Request):
     """List all Dokku apps."""
-    client = DokkuClient()
-    apps = await client.get_all_apps()
+    client = get_client()
+    stream = not (client.use_docker or client.all_apps_cached())
+    if stream:
+        # Cold SSH cache: paint a card per app now, /apps/stream fills them in
+        apps = [App(name=name) for name in await client.apps_list()]
+    else:
+        apps = await client.get_all_apps()
 
-    return templates.TemplateResponse(
+    return with_etag(request, templates.TemplateResponse(
         "apps/list.html",
-        {"request": request, "apps": apps},
-    )
+        {"request": request, "apps": apps, "stream": stream},
+    ))
+
+
+@router.get("/stream")
+async def stream_apps(request: Request):
+    """Stream app cards via SSE as each app's info arrives, then a final "done"."""
+    card = templates.get_template("components/app_card.html")
+
+    async def generate():
+        client = get_client()
+        async for app in client.stream_apps():
+            yield {"event": f"app-{app.name}", "data": card.render(request=request, app=app)}
+        # Tells the page to close the EventSource instead of reconnecting
+        yield {"event": "done", "data": ""}
+
+    return EventSourceResponse(generate())
 
 
 @router.get("/{app_name}", response_class=HTMLResponse)
 async def app_detail(request: Request, app_name: str):
     """Get app details."""
-    client = DokkuClient()
+    client = get_client()
     
     # Gather all app information in parallel
-    import asyncio
     app, config, scaling, network, storage, ssl_status, health = await asyncio.gather(
         client.app_info(app_name),
         client.config_list(app_name),
@@ -39,7 +76,7 @@ async def app_detail(request: Request, app_name: str):
         client.get_app_health_checks(app_name),
     )
 
-    return templates.TemplateResponse(
+    return with_etag(request, templates.TemplateResponse(
         "apps/detail.html",
         {
             "request": request,
@@ -51,16 +88,15 @@ async def app_detail(request: Request, app_name: str):
             "ssl": ssl_status,
             "health": health,
         },
-    )
+    ))
 
 
 @router.post("/{app_name}/start", response_class=HTMLResponse)
 async def start_app(request: Request, app_name: str):
     """Start an app."""
-    client = DokkuClient()
+    client = get_client()
     await client.app_start(app_name)
     
-    import asyncio
     app, ssl_status = await asyncio.gather(
         client.app_info(app_name),
         client.get_app_ssl_status(app_name),
@@ -83,47 +119,36 @@ async def start_app(request: Request, app_name: str):
 @router.post("/{app_name}/stop", response_class=HTMLResponse)
 async def stop_app(request: Request, app_name: str):
     """Stop an app."""
-    import logging
-    logger = logging.getLogger(__name__)
+    logger.info("Stopping app: %s", app_name)
+    client = get_client()
+    result = await client.app_stop(app_name)
+    logger.debug("Stop result: %s", result)
+    
+    app, ssl_status = await asyncio.gather(
+        client.app_info(app_name),
+        client.get_app_ssl_status(app_name),
+    )
     
-    try:
-        logger.info(f"Stopping app: {app_name}")
-        client = DokkuClient()
-        result = await client.app_stop(app_name)
-        logger.info(f"Stop result: {result}")
-        
-        import asyncio
-        app, ssl_status = await asyncio.gather(
-            client.app_info(app_name),
-            client.get_app_ssl_status(app_name),
+    # Check if called from detail page or list page
+    target = request.headers.get("hx-target", "")
+    if target == "#app-status":
+        return templates.TemplateResponse(
+            "components/app_status.html",
+            {"request": request, "app": app, "ssl": ssl_status},
+        )
+    else:
+        return templates.TemplateResponse(
+            "components/app_card.html",
+            {"request": request, "app": app},
         )
-        
-        # Check if called from detail page or list page
-        target = request.headers.get("hx-target", "")
-        logger.info(f"Target: {target}")
-        
-        if target == "#app-status":
-            return templates.TemplateResponse(
-                "components/app_status.html",
-                {"request": request, "app": app, "ssl": ssl_status},
-            )
-        else:
-            return templates.TemplateResponse(
-                "components/app_card.html",
-                {"request": request, "app": app},
-            )
-    except Exception as e:
-        logger.error(f"Error stopping app {app_name}: {e}", exc_info=True)
-        raise
 
 
 @router.post("/{app_name}/restart", response_class=HTMLResponse)
 async def restart_app(request: Request, app_name: str):
     """Restart an app."""
-    client = DokkuClient()
+    client = get_client()
     await client.app_restart(app_name)
     
-    import asyncio
     app, ssl_status = await asyncio.gather(
         client.app_info(app_name),
         client.get_app_ssl_status(app_name),
@@ -146,7 +171,7 @@ async def restart_app(request: Request, app_name: str):
 @router.post("/{app_name}/rebuild", response_class=HTMLResponse)
 async def rebuild_app(request: Request, app_name: str):
     """Rebuild an app."""
-    client = DokkuClient()
+    client = get_client()
     await client.app_rebuild(app_name)
     app = await client.app_info(app_name)
 
@@ -159,32 +184,21 @@ async def rebuild_app(request: Request, app_name: str):
 @router.get("/{app_name}/card", response_class=HTMLResponse)
 async def app_card(request: Request, app_name: str):
     """Get single app card (for HTMX refresh)."""
-    client = DokkuClient()
+    client = get_client()
     app = await client.app_info(app_name)
 
-    return templates.TemplateResponse(
+    return with_etag(request, templates.TemplateResponse(
         "components/app_card.html",
         {"request": request, "app": app},
-    )
+    ))
 
 
 @router.get("/{app_name}/status", response_class=HTMLResponse)
 async def app_status(request: Request, app_name: str):
     """Get app status badge (for lazy loading)."""
-    client = DokkuClient()
+    client = get_client()
     status = await client.app_status(app_name)
 
     # Return just the status badge HTML
-    status_colors = {
-        "running": "bg-green-500",
-        "stopped": "bg-red-500",
-        "crashed": "bg-orange-500",
-        "unknown": "bg-gray-500",
-    }
-    color = status_colors.get(status.value, "bg-gray-500")
-
-    return HTMLResponse(
-        f'<span class="px-2 py-1 text-xs font-medium text-white rounded-full {color}">'
-        f'{status.value}</span>'
-    )
+    return with_etag(request, HTMLResponse(STATUS_BADGES[status]))
 
@@ -2,24 +2,23 @@
 
 from fastapi import APIRouter, Form, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 
-from app.dokku import DokkuClient
+from app.dokku import get_client
+from app.templating import templates, with_etag
 
 router = APIRouter(prefix="/config", tags=["config"])
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/{app_name}", response_class=HTMLResponse)
 async def config_list(request: Request, app_name: str):
     """List environment variables."""
-    client = DokkuClient()
+    client = get_client()
     config = await client.config_list(app_name)
 
-    return templates.TemplateResponse(
+    return with_etag(request, templates.TemplateResponse(
         "components/config_list.html",
         {"request": request, "app_name": app_name, "config": config},
-    )
+    ))
 
 
 @router.get("/{app_name}/form", response_class=HTMLResponse)
@@ -40,7 +39,7 @@ async def config_set(
     restart: bool = Form(True),
 ):
     """Set an environment variable."""
-    client = DokkuClient()
+    client = get_client()
     await client.config_set(app_name, key, value, restart=restart)
 
     # Return updated config list
@@ -59,7 +58,7 @@ async def config_unset(
     restart: bool = True,
 ):
     """Unset an environment variable."""
-    client = DokkuClient()
+    client = get_client()
     await client.config_unset(app_name, key, restart=restart)
 
     # Return updated config list
@@ -1,23 +1,41 @@
 """Plugins routes."""
 
+import asyncio
+import os
+import tomllib
+
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+
+from app.dokku import get_client
+from app.templating import templates
 
 router = APIRouter(prefix="/plugins", tags=["plugins"])
-templates = Jinja2Templates(directory="app/templates")
+
+# plugin.toml path -> (mtime_ns, (description, version)); plugins rarely change
+_plugin_meta_cache: dict[str, tuple[int, tuple[str, str]]] = {}
 
 
 @router.get("", response_class=HTMLResponse)
 async def list_plugins(request: Request):
     """List installed Dokku plugins."""
-    import asyncio
-    import os
+    # Read plugins from filesystem (more reliable than dokku command), off the event loop
+    plugins = await asyncio.to_thread(_read_plugins, "/var/lib/dokku/plugins/enabled")
     
-    plugins = []
+    # Get apps using each plugin - the lookups are independent, so run them together
+    plugin_apps = await asyncio.gather(*(_get_plugin_apps(plugin["name"]) for plugin in plugins))
+    for plugin, apps in zip(plugins, plugin_apps):
+        plugin["apps"] = apps
     
-    # Read plugins from filesystem (more reliable than dokku command)
-    plugin_dir = "/var/lib/dokku/plugins/enabled"
+    return templates.TemplateResponse(
+        "plugins/list.html",
+        {"request": request, "plugins": plugins},
+    )
+
+
+def _read_plugins(plugin_dir: str) -> list[dict]:
+    """Read name, version and description of enabled plugins (blocking - run in a thread)."""
+    plugins = []
     try:
         if os.path.exists(plugin_dir):
             for plugin_name in sorted(os.listdir(plugin_dir)):
@@ -25,71 +43,76 @@ async def list_plugins(request: Request):
                     continue
                 
                 # Try to get plugin info file
-                info_file = f"{plugin_dir}/{plugin_name}/plugin.toml"
-                description = ""
-                version = "enabled"
+                description, version = _read_plugin_meta(f"{plugin_dir}/{plugin_name}/plugin.toml")
                 
-                if os.path.exists(info_file):
-                    try:
-                        with open(info_file, "r") as f:
-                            for line in f:
-                                if "description" in line:
-                                    description = line.split("=", 1)[1].strip().strip('"')
-                                elif "version" in line:
-                                    version = line.split("=", 1)[1].strip().strip('"')
-                    except:
-                        pass
-                
-                plugin = {
+                plugins.append({
                     "name": plugin_name,
                     "version": version,
                     "description": description,
-                }
-                
-                # Get apps using this plugin
-                plugin["apps"] = await _get_plugin_apps(plugin_name)
-                plugins.append(plugin)
+                })
     except OSError:
         pass
     
-    return templates.TemplateResponse(
-        "plugins/list.html",
-        {"request": request, "plugins": plugins},
-    )
+    return plugins
+
+
+def _read_plugin_meta(info_file: str) -> tuple[str, str]:
+    """Get (description, version) from a plugin.toml, re-parsing only when it changes."""
+    try:
+        mtime = os.stat(info_file).st_mtime_ns
+    except OSError:
+        return "", "enabled"
+    
+    cached = _plugin_meta_cache.get(info_file)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    try:
+        with open(info_file, "rb") as f:
+            data = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError):
+        data = {}
+    # Fields live under [plugin]; accept top-level ones too
+    info = data.get("plugin", data)
+    meta = (str(info.get("description", "")), str(info.get("version", "enabled")))
+    _plugin_meta_cache[info_file] = (mtime, meta)
+    return meta
 
 
 async def _get_plugin_apps(plugin_name: str) -> list[str]:
     """Get apps using a specific plugin."""
-    import asyncio
-    import os
-    
     apps_using_plugin = []
     
     # Check for service plugins (postgres, redis, mysql, etc.)
     if plugin_name in ["postgres", "redis", "mysql", "mongo", "elasticsearch"]:
-        proc = await asyncio.create_subprocess_exec(
-            "dokku", f"{plugin_name}:list",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await proc.communicate()
+        try:
+            stdout, _ = await get_client()._exec("dokku", f"{plugin_name}:list", timeout=30)
+        except (OSError, TimeoutError):
+            return []  # Plugin listed but its command is missing or hung
         
-        for line in stdout.decode().strip().split("\n"):
+        for line in stdout.decode().splitlines():
             if line and not line.startswith("===") and not line.startswith("----"):
                 service_name = line.split()[0]
                 apps_using_plugin.append(service_name)
     
     # Check for letsencrypt
     elif plugin_name == "letsencrypt":
-        try:
-            for app_dir in os.listdir("/home/dokku"):
-                if app_dir.startswith(".") or app_dir in {"ENV", "VHOST", "tls", "dokkurc"}:
-                    continue
-                letsencrypt_dir = f"/home/dokku/{app_dir}/letsencrypt"
-                if os.path.exists(letsencrypt_dir):
-                    apps_using_plugin.append(app_dir)
-        except OSError:
-            pass
+        apps_using_plugin = await asyncio.to_thread(_letsencrypt_apps)
     
     return apps_using_plugin
 
+
+def _letsencrypt_apps() -> list[str]:
+    """Apps with a letsencrypt directory (blocking - run in a thread)."""
+    apps = []
+    try:
+        for app_dir in os.listdir("/home/dokku"):
+            if app_dir.startswith(".") or app_dir in {"ENV", "VHOST", "tls", "dokkurc"}:
+                continue
+            letsencrypt_dir = f"/home/dokku/{app_dir}/letsencrypt"
+            if os.path.exists(letsencrypt_dir):
+                apps.append(app_dir)
+    except OSError:
+        pass
+    return apps
+
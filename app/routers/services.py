@@ -1,37 +1,44 @@
 """Services management routes."""
 
 import asyncio
+import logging
 import os
+import re
+from pathlib import Path
+
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 
+from app.cache import cached
+from app.dokku import get_client
 from app.dokku.models import Service
+from app.templating import templates
 
 router = APIRouter(prefix="/services", tags=["services"])
-templates = Jinja2Templates(directory="app/templates")
+logger = logging.getLogger(__name__)
+
+SERVICES_DIR = "/var/lib/dokku/services"
+
+# Service plugin types and the ENV variables holding their DSN, in lookup order
+SERVICE_DSN_KEYS = {
+    "redis": ("REDIS_URL",),
+    "postgres": ("DATABASE_URL",),
+    "mysql": ("DATABASE_URL",),
+    "mongo": ("MONGO_URL", "DATABASE_URL"),
+}
+# Linked apps reach a service as dokku-<type>-<name> (or dokku.<type>.<name>)
+SERVICE_REF_RE = re.compile(rf"dokku[.-]({'|'.join(SERVICE_DSN_KEYS)})[.-]([A-Za-z0-9_-]+)".encode())
+# One pattern per type, searched over the whole ENV file
+SERVICE_DSN_RES = {
+    kind: re.compile(rf"""(?:{'|'.join(keys)})=["']?([^"'\n]*)""".encode())
+    for kind, keys in SERVICE_DSN_KEYS.items()
+}
 
 
 @router.get("", response_class=HTMLResponse)
 async def list_services(request: Request):
     """List all Dokku services."""
-    services = []
-    
-    # Get Redis services
-    redis_services = await _get_redis_services()
-    services.extend(redis_services)
-    
-    # Get Postgres services
-    postgres_services = await _get_postgres_services()
-    services.extend(postgres_services)
-    
-    # Get MySQL services
-    mysql_services = await _get_mysql_services()
-    services.extend(mysql_services)
-    
-    # Get Mongo services
-    mongo_services = await _get_mongo_services()
-    services.extend(mongo_services)
+    services = await cached(("services",), 5, _get_all_services)
     
     return templates.TemplateResponse(
         "services/list.html",
@@ -39,293 +46,148 @@ async def list_services(request: Request):
     )
 
 
-async def _get_redis_services() -> list[Service]:
-    """Get all Redis services."""
-    services = []
-    redis_dir = "/var/lib/dokku/services/redis"
-    
-    try:
-        if not os.path.exists(redis_dir):
-            return services
-        
-        for service_name in os.listdir(redis_dir):
-            if service_name.startswith("."):
-                continue
-            
-            service_path = f"{redis_dir}/{service_name}"
-            if not os.path.isdir(service_path):
-                continue
-            
-            # Get service info using docker
-            proc = await asyncio.create_subprocess_exec(
-                "docker", "inspect", f"dokku.redis.{service_name}",
-                "--format", "{{.State.Status}}|{{.Config.Image}}",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await proc.communicate()
-            
-            status = "stopped"
-            version = "unknown"
-            
-            if stdout:
-                parts = stdout.decode().strip().split("|")
-                if len(parts) >= 2:
-                    status = "running" if parts[0] == "running" else "stopped"
-                    version = parts[1].replace("redis:", "").replace("redis/redis:", "")
-            
-            # Read DSN from ENV file
-            dsn = ""
-            env_file = f"{service_path}/ENV"
-            if os.path.exists(env_file):
-                try:
-                    with open(env_file, "r") as f:
-                        for line in f:
-                            if line.startswith("export REDIS_URL="):
-                                dsn = line.split("=", 1)[1].strip().strip('"').strip("'")
-                                break
-                except:
-                    pass
-            
-            # Get linked apps
-            linked_apps = await _get_service_links(service_name, "redis")
-            
-            services.append(Service(
-                name=service_name,
-                type="redis",
-                version=version,
-                status=status,
-                dsn=dsn,
-                linked_apps=linked_apps,
-                config_dir=f"{service_path}/config",
-                data_dir=f"{service_path}/data",
-            ))
-    
-    except OSError:
-        pass
-    
-    return services
+async def _get_all_services() -> list[Service]:
+    """Get services of every supported type."""
+    # One container listing and one pass over app ENVs serve every type
+    containers, links = await asyncio.gather(
+        _snapshot_containers(),
+        asyncio.to_thread(_load_service_links),
+    )
+    # The directory walks and ENV reads block, so keep them off the event loop
+    results = await asyncio.gather(*(
+        asyncio.to_thread(_get_services, kind, containers, links) for kind in SERVICE_DSN_KEYS
+    ))
+    return [service for group in results for service in group]
 
 
-async def _get_postgres_services() -> list[Service]:
-    """Get all Postgres services."""
+def _get_services(
+    kind: str, containers: dict[str, tuple[str, str]], links: dict[tuple[str, str], list[str]]
+) -> list[Service]:
+    """Get all services of one plugin type (redis, postgres, ...) (blocking - run in a thread)."""
     services = []
-    postgres_dir = "/var/lib/dokku/services/postgres"
+    kind_dir = f"{SERVICES_DIR}/{kind}"
     
+    # scandir gets the entry type from the directory listing - no stat per service
     try:
-        if not os.path.exists(postgres_dir):
-            return services
+        with os.scandir(kind_dir) as entries:
+            service_dirs = [
+                entry for entry in entries
+                if not entry.name.startswith(".") and entry.is_dir()
+            ]
+    except FileNotFoundError:
+        return services  # plugin not installed
+    except OSError as e:
+        logger.warning("Cannot list %s services: %s", kind, e)
+        return services
+    
+    for entry in service_dirs:
+        service_name = entry.name
+        service_path = entry.path
         
-        for service_name in os.listdir(postgres_dir):
-            if service_name.startswith("."):
-                continue
-            
-            service_path = f"{postgres_dir}/{service_name}"
-            if not os.path.isdir(service_path):
-                continue
-            
-            # Get service info
-            proc = await asyncio.create_subprocess_exec(
-                "docker", "inspect", f"dokku.postgres.{service_name}",
-                "--format", "{{.State.Status}}|{{.Config.Image}}",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await proc.communicate()
-            
-            status = "stopped"
-            version = "unknown"
-            
-            if stdout:
-                parts = stdout.decode().strip().split("|")
-                if len(parts) >= 2:
-                    status = "running" if parts[0] == "running" else "stopped"
-                    version = parts[1].replace("postgres:", "")
-            
-            # Read DSN
-            dsn = ""
-            env_file = f"{service_path}/ENV"
-            if os.path.exists(env_file):
-                try:
-                    with open(env_file, "r") as f:
-                        for line in f:
-                            if "DATABASE_URL=" in line:
-                                dsn = line.split("=", 1)[1].strip().strip('"').strip("'")
-                                break
-                except:
-                    pass
-            
-            linked_apps = await _get_service_links(service_name, "postgres")
-            
-            services.append(Service(
-                name=service_name,
-                type="postgres",
-                version=version,
-                status=status,
-                dsn=dsn,
-                linked_apps=linked_apps,
-                config_dir=f"{service_path}/config",
-                data_dir=f"{service_path}/data",
-            ))
-    
-    except OSError:
-        pass
-    
-    return services
-
-
-async def _get_mysql_services() -> list[Service]:
-    """Get all MySQL services."""
-    services = []
-    mysql_dir = "/var/lib/dokku/services/mysql"
-    
-    try:
-        if not os.path.exists(mysql_dir):
-            return services
+        status = "stopped"
+        version = "unknown"
+        state = containers.get(f"dokku.{kind}.{service_name}")
+        if state:
+            status = "running" if state[0] == "running" else "stopped"
+            version = _image_version(state[1])
         
-        for service_name in os.listdir(mysql_dir):
-            if service_name.startswith("."):
-                continue
-            
-            service_path = f"{mysql_dir}/{service_name}"
-            if not os.path.isdir(service_path):
-                continue
-            
-            proc = await asyncio.create_subprocess_exec(
-                "docker", "inspect", f"dokku.mysql.{service_name}",
-                "--format", "{{.State.Status}}|{{.Config.Image}}",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await proc.communicate()
-            
-            status = "stopped"
-            version = "unknown"
-            
-            if stdout:
-                parts = stdout.decode().strip().split("|")
-                if len(parts) >= 2:
-                    status = "running" if parts[0] == "running" else "stopped"
-                    version = parts[1].replace("mysql:", "")
-            
+        # One unreadable ENV shouldn't hide the service or its siblings
+        try:
+            dsn = _read_dsn(f"{service_path}/ENV", SERVICE_DSN_RES[kind])
+        except OSError as e:
+            logger.warning("Cannot read DSN for %s service %s: %s", kind, service_name, e)
             dsn = ""
-            env_file = f"{service_path}/ENV"
-            if os.path.exists(env_file):
-                try:
-                    with open(env_file, "r") as f:
-                        for line in f:
-                            if "DATABASE_URL=" in line:
-                                dsn = line.split("=", 1)[1].strip().strip('"').strip("'")
-                                break
-                except:
-                    pass
-            
-            linked_apps = await _get_service_links(service_name, "mysql")
-            
-            services.append(Service(
-                name=service_name,
-                type="mysql",
-                version=version,
-                status=status,
-                dsn=dsn,
-                linked_apps=linked_apps,
-                config_dir=f"{service_path}/config",
-                data_dir=f"{service_path}/data",
-            ))
-    
-    except OSError:
-        pass
+        linked_apps = links.get((kind, service_name), [])
+        
+        services.append(Service(
+            name=service_name,
+            type=kind,
+            version=version,
+            status=status,
+            dsn=dsn,
+            linked_apps=linked_apps,
+            config_dir=f"{service_path}/config",
+            data_dir=f"{service_path}/data",
+        ))
     
     return services
 
 
-async def _get_mongo_services() -> list[Service]:
-    """Get all Mongo services."""
-    services = []
-    mongo_dir = "/var/lib/dokku/services/mongo"
+async def _snapshot_containers() -> dict[str, tuple[str, str]]:
+    """Get {container name: (state, image)} for every container in one listing."""
+    # Straight from the Docker socket when mounted - no CLI fork
+    client = get_client()
+    if client.use_docker:
+        return await client.container_states()
     
     try:
-        if not os.path.exists(mongo_dir):
-            return services
-        
-        for service_name in os.listdir(mongo_dir):
-            if service_name.startswith("."):
-                continue
-            
-            service_path = f"{mongo_dir}/{service_name}"
-            if not os.path.isdir(service_path):
-                continue
-            
-            proc = await asyncio.create_subprocess_exec(
-                "docker", "inspect", f"dokku.mongo.{service_name}",
-                "--format", "{{.State.Status}}|{{.Config.Image}}",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await proc.communicate()
-            
-            status = "stopped"
-            version = "unknown"
-            
-            if stdout:
-                parts = stdout.decode().strip().split("|")
-                if len(parts) >= 2:
-                    status = "running" if parts[0] == "running" else "stopped"
-                    version = parts[1].replace("mongo:", "")
-            
-            dsn = ""
-            env_file = f"{service_path}/ENV"
-            if os.path.exists(env_file):
-                try:
-                    with open(env_file, "r") as f:
-                        for line in f:
-                            if "MONGO_URL=" in line or "DATABASE_URL=" in line:
-                                dsn = line.split("=", 1)[1].strip().strip('"').strip("'")
-                                break
-                except:
-                    pass
-            
-            linked_apps = await _get_service_links(service_name, "mongo")
-            
-            services.append(Service(
-                name=service_name,
-                type="mongo",
-                version=version,
-                status=status,
-                dsn=dsn,
-                linked_apps=linked_apps,
-                config_dir=f"{service_path}/config",
-                data_dir=f"{service_path}/data",
-            ))
-    
-    except OSError:
-        pass
-    
-    return services
+        stdout, _ = await client._exec(
+            "docker", "ps", "-a", "--no-trunc",
+            "--format", "{{.Names}}|{{.State}}|{{.Image}}",
+            timeout=30,
+        )
+    except (OSError, TimeoutError) as e:
+        logger.warning("Listing containers failed: %r", e)
+        return {}
+    
+    containers = {}
+    for line in stdout.decode().splitlines():
+        parts = line.strip().split("|")
+        if len(parts) >= 3:
+            containers[parts[0]] = (parts[1], parts[2])
+    return containers
+
+
+def _image_version(image: str) -> str:
+    """Get the tag of an image reference ("redis:7.2" -> "7.2")."""
+    _, sep, tag = image.rpartition(":")
+    return tag if sep and "/" not in tag else image
+
+
+def _read_dsn(env_file: str, pattern: re.Pattern) -> str:
+    """Read the DSN matched by pattern from a service ENV file."""
+    try:
+        # Search the raw bytes; only the DSN itself gets decoded
+        match = pattern.search(Path(env_file).read_bytes())
+    except FileNotFoundError:
+        return ""
+    return match.group(1).strip().decode(errors="replace") if match else ""
 
 
-async def _get_service_links(service_name: str, service_type: str) -> list[str]:
-    """Get apps linked to a service."""
-    linked_apps = []
-    
-    # Check each app's ENV file for this service
+def _load_app_envs() -> dict[str, bytes]:
+    """Read every app's ENV file once: {app name: contents} (blocking - run in a thread)."""
+    envs = {}
     try:
-        for app_dir in os.listdir("/home/dokku"):
-            if app_dir.startswith(".") or app_dir in {"ENV", "VHOST", "tls", "dokkurc"}:
-                continue
-            
-            env_file = f"/home/dokku/{app_dir}/ENV"
-            if os.path.exists(env_file):
+        with os.scandir("/home/dokku") as entries:
+            for entry in entries:
+                if (
+                    entry.name.startswith(".")
+                    or entry.name in {"ENV", "VHOST", "tls", "dokkurc"}
+                    or not entry.is_dir()
+                ):
+                    continue
+                
+                # Opening directly is one syscall; a missing ENV just raises
                 try:
-                    with open(env_file, "r") as f:
-                        content = f.read()
-                        # Check if service is referenced in env
-                        if f"dokku.{service_type}.{service_name}" in content or f"{service_name}" in content:
-                            linked_apps.append(app_dir)
-                except:
+                    # Bytes, so an ENV that isn't valid UTF-8 can't fail the listing
+                    with open(f"{entry.path}/ENV", "rb") as f:
+                        envs[entry.name] = f.read()
+                except OSError:
                     pass
     except OSError:
         pass
     
-    return linked_apps
+    return envs
+
 
+def _load_service_links() -> dict[tuple[str, str], list[str]]:
+    """Map (service type, service name) to the apps whose ENV references it (blocking)."""
+    links: dict[tuple[str, str], list[str]] = {}
+    for app, content in _load_app_envs().items():
+        refs = {
+            (kind.decode(), name.decode())
+            for kind, name in (match.groups() for match in SERVICE_REF_RE.finditer(content))
+        }
+        for ref in refs:
+            links.setdefault(ref, []).append(app)
+    return links
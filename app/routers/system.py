@@ -1,105 +1,179 @@
 """System information routes."""
 
+import asyncio
+import json
+import logging
 import os
+import re
+import time
+
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+
+from app.cache import cached
+from app.dokku import get_client
+from app.templating import templates
 
 router = APIRouter(prefix="/system", tags=["system"])
-templates = Jinja2Templates(directory="app/templates")
+logger = logging.getLogger(__name__)
+
+MEMINFO_RE = re.compile(rb"^(\w+):\s+(\d+) kB", re.M)
+
+# Background refresh period, and how long after the last /system view it keeps going
+REFRESH_INTERVAL = 60
+VIEW_IDLE = 600
+# Longest wait between attempts while refreshing keeps failing
+MAX_BACKOFF = 600
+# Per-command cap, so one hung dokku/docker call can't stall the refresh
+RUN_TIMEOUT = 10
+
+# Commands whose failure was already logged, so a missing binary warns once
+_failed_commands: set[str] = set()
 
 
 @router.get("", response_class=HTMLResponse)
 async def system_info(request: Request):
     """Show Dokku system information."""
-    import asyncio
-    
-    # Get Dokku version
-    proc = await asyncio.create_subprocess_exec(
-        "dokku", "version",
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, _ = await proc.communicate()
-    dokku_version = stdout.decode().strip()
-    
-    # Get disk usage
-    proc = await asyncio.create_subprocess_exec(
-        "df", "-h", "/",
-        stdout=asyncio.subprocess.PIPE,
-    )
-    stdout, _ = await proc.communicate()
-    disk_lines = stdout.decode().strip().split("\n")
-    disk_info = disk_lines[1].split() if len(disk_lines) > 1 else []
-    
-    # Get memory usage
-    proc = await asyncio.create_subprocess_exec(
-        "free", "-h",
-        stdout=asyncio.subprocess.PIPE,
-    )
-    stdout, _ = await proc.communicate()
-    mem_lines = stdout.decode().strip().split("\n")
-    mem_info = mem_lines[1].split() if len(mem_lines) > 1 else []
+    state = request.app.state
+    state.system_viewed_at = time.monotonic()
+    # Kept fresh by refresh_system_stats while the page is being viewed; the
+    # first view after startup or an idle spell fetches on its own
+    stats = getattr(state, "system_stats", None)
+    if stats is not None and stats[0] > time.monotonic() - 2 * REFRESH_INTERVAL:
+        system_data = stats[1]
+    else:
+        system_data = await cached(("system_info",), 30, _get_system_data)
+        state.system_stats = (time.monotonic(), system_data)
     
-    # Get Docker info
-    proc = await asyncio.create_subprocess_exec(
-        "docker", "info", "--format", "{{.ServerVersion}}",
-        stdout=asyncio.subprocess.PIPE,
+    return templates.TemplateResponse(
+        "system/info.html",
+        {"request": request, "system": system_data},
     )
-    stdout, _ = await proc.communicate()
-    docker_version = stdout.decode().strip()
-    
-    # Count Docker objects
-    proc = await asyncio.create_subprocess_exec(
-        "docker", "ps", "-aq",
-        stdout=asyncio.subprocess.PIPE,
+
+
+async def refresh_system_stats(state, interval: float = REFRESH_INTERVAL) -> None:
+    """Refresh state.system_stats every interval seconds while /system is being viewed.
+
+    Failures are logged once per failing streak and back off up to MAX_BACKOFF.
+    """
+    delay = interval
+    while True:
+        await asyncio.sleep(delay)
+        viewed_at = getattr(state, "system_viewed_at", None)
+        if viewed_at is None or time.monotonic() - viewed_at > VIEW_IDLE:
+            continue
+        try:
+            state.system_stats = (time.monotonic(), await _get_system_data())
+        except Exception:
+            if delay == interval:
+                logger.exception("Refreshing system stats failed; backing off")
+            delay = min(delay * 2, MAX_BACKOFF)
+        else:
+            delay = interval
+
+
+async def _get_system_data() -> dict:
+    """Collect versions, resource usage and object counts."""
+    # The commands are independent - run them all at once
+    dokku_out, docker_out, df_out = await asyncio.gather(
+        _run("dokku", "version"),
+        _run("docker", "version", "--format", "{{.Server.Version}}"),
+        _run("docker", "system", "df", "--format", "{{json .}}"),
     )
-    stdout, _ = await proc.communicate()
-    container_count = len([l for l in stdout.decode().strip().split("\n") if l])
+    dokku_version = dokku_out.decode().strip() or "N/A"
     
-    proc = await asyncio.create_subprocess_exec(
-        "docker", "images", "-q",
-        stdout=asyncio.subprocess.PIPE,
-    )
-    stdout, _ = await proc.communicate()
-    image_count = len([l for l in stdout.decode().strip().split("\n") if l])
+    docker_version = docker_out.decode().strip() or "N/A"
     
-    proc = await asyncio.create_subprocess_exec(
-        "docker", "volume", "ls", "-q",
-        stdout=asyncio.subprocess.PIPE,
-    )
-    stdout, _ = await proc.communicate()
-    volume_count = len([l for l in stdout.decode().strip().split("\n") if l])
+    # Count Docker objects: one JSON row per object type
+    counts = {}
+    for line in df_out.splitlines():
+        try:
+            row = json.loads(line)
+            counts[row["Type"]] = int(row["TotalCount"])
+        except (ValueError, KeyError):
+            continue
+    container_count = counts.get("Containers", 0)
+    image_count = counts.get("Images", 0)
+    volume_count = counts.get("Local Volumes", 0)
     
     # Count Dokku apps
     try:
-        app_count = len([d for d in os.listdir("/home/dokku") 
-                        if not d.startswith(".") and d not in {"ENV", "VHOST", "tls", "dokkurc"}])
+        with os.scandir("/home/dokku") as entries:
+            app_count = sum(
+                1 for entry in entries
+                if not entry.name.startswith(".")
+                and entry.name not in {"ENV", "VHOST", "tls", "dokkurc"}
+                and entry.is_dir()
+            )
     except OSError:
         app_count = 0
     
-    system_data = {
+    return {
         "dokku_version": dokku_version,
         "docker_version": docker_version,
-        "disk": {
-            "size": disk_info[1] if len(disk_info) > 1 else "N/A",
-            "used": disk_info[2] if len(disk_info) > 2 else "N/A",
-            "available": disk_info[3] if len(disk_info) > 3 else "N/A",
-            "percent": disk_info[4] if len(disk_info) > 4 else "N/A",
-        },
-        "memory": {
-            "total": mem_info[1] if len(mem_info) > 1 else "N/A",
-            "used": mem_info[2] if len(mem_info) > 2 else "N/A",
-            "free": mem_info[3] if len(mem_info) > 3 else "N/A",
-        },
+        "disk": _disk_usage("/"),
+        "memory": _memory_usage(),
         "apps": app_count,
         "containers": container_count,
         "images": image_count,
         "volumes": volume_count,
     }
-    
-    return templates.TemplateResponse(
-        "system/info.html",
-        {"request": request, "system": system_data},
-    )
 
+
+def _disk_usage(path: str) -> dict:
+    """Disk usage of the filesystem holding path, as `df -h` reports it."""
+    try:
+        st = os.statvfs(path)
+    except OSError:
+        return {"size": "N/A", "used": "N/A", "available": "N/A", "percent": "N/A"}
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    available = st.f_bavail * st.f_frsize
+    # Like df: share of the space usable by non-root, rounded up
+    percent = -(-used * 100 // (used + available)) if used + available else 0
+    return {
+        "size": _human_size(st.f_blocks * st.f_frsize),
+        "used": _human_size(used),
+        "available": _human_size(available),
+        "percent": f"{percent}%",
+    }
+
+
+def _memory_usage() -> dict:
+    """Memory usage from /proc/meminfo, as `free -h` reports it."""
+    try:
+        with open("/proc/meminfo", "rb") as f:
+            fields = {key: int(kb) * 1024 for key, kb in MEMINFO_RE.findall(f.read())}
+        total = fields[b"MemTotal"]
+        free = fields[b"MemFree"]
+        available = fields.get(b"MemAvailable", free)
+    except (OSError, KeyError):
+        return {"total": "N/A", "used": "N/A", "free": "N/A"}
+    return {
+        "total": _human_size(total),
+        "used": _human_size(total - available),
+        "free": _human_size(free),
+    }
+
+
+def _human_size(num: int) -> str:
+    """Format a byte count with a binary suffix ("512M", "1.5G", "20G")."""
+    size = float(num)
+    for unit in ("B", "K", "M", "G", "T"):
+        if size < 1024 or unit == "T":
+            break
+        size /= 1024
+    return f"{size:.1f}{unit}" if size < 10 and unit != "B" else f"{size:.0f}{unit}"
+
+
+async def _run(*argv: str) -> bytes:
+    """Run a command and return its stdout; empty if it is missing or times out."""
+    command = " ".join(argv)
+    try:
+        stdout, _ = await get_client()._exec(*argv, timeout=RUN_TIMEOUT)
+    except (OSError, TimeoutError) as e:
+        if command not in _failed_commands:
+            _failed_commands.add(command)
+            logger.warning("`%s` failed: %r", command, e)
+        return b""
+    _failed_commands.discard(command)
+    return stdout
@@ -0,0 +1,45 @@
+"""Static file serving with in-memory assets and browser caching."""
+
+import hashlib
+from mimetypes import guess_type
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+# Assets are not content-hashed, so cache for a day rather than forever
+CACHE_CONTROL = "public, max-age=86400"
+MAX_CACHED_SIZE = 64 * 1024
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that serves small assets from memory with Cache-Control."""
+
+    def __init__(self, *, directory: str) -> None:
+        super().__init__(directory=directory)
+        self._assets: dict[str, tuple[bytes, dict[str, str]]] = {}
+        root = Path(directory)
+        for path in root.rglob("*"):
+            if not path.is_file() or path.stat().st_size > MAX_CACHED_SIZE:
+                continue
+            body = path.read_bytes()
+            headers = {
+                "Content-Type": guess_type(path.name)[0] or "application/octet-stream",
+                "ETag": f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"',
+                "Cache-Control": CACHE_CONTROL,
+            }
+            self._assets[path.relative_to(root).as_posix()] = (body, headers)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        asset = self._assets.get(path)
+        if asset is not None and scope["method"] == "GET":
+            body, headers = asset
+            if headers["ETag"] in Headers(scope=scope).get("if-none-match", ""):
+                return Response(status_code=304, headers=headers)
+            return Response(body, headers=headers)
+
+        response = await super().get_response(path, scope)
+        response.headers.setdefault("Cache-Control", CACHE_CONTROL)
+        return response
@@ -0,0 +1,25 @@
+"""Shared Jinja2 templates."""
+
+import hashlib
+
+from fastapi import Request, Response
+from fastapi.templating import Jinja2Templates
+
+from app.config import get_settings
+
+# One Environment for every router, so compiled templates are cached once
+templates = Jinja2Templates(directory="app/templates")
+
+# Templates only change on deploy; skip the per-render mtime check outside debug
+templates.env.auto_reload = get_settings().debug
+
+
+def with_etag(request: Request, response: Response) -> Response:
+    """Tag a rendered response with a weak ETag; 304 if the client already has it."""
+    etag = f'W/"{hashlib.blake2b(response.body, digest_size=8).hexdigest()}"'
+    # Always revalidate: polled fragments must reflect start/stop right away
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return response
@@ -0,0 +1,47 @@
+"""ENV file parsing and formatting."""
+
+import asyncio
+import io
+
+import pytest
+
+from app.dokku.client import DokkuClient, _format_env, _parse_env_file
+
+VALUES = {
+    "PLAIN": "value",
+    "EMPTY": "",
+    "SPACES": "two words",
+    "SINGLE": "it's",
+    "DOUBLE": 'say "hi"',
+    "SHELLY": "$HOME `id` \\n; #not-a-comment",
+    "MULTILINE": "-----BEGIN KEY-----\nabc\n\ndef\n-----END KEY-----\n",
+}
+
+
+def test_round_trip():
+    assert _parse_env_file(_format_env(VALUES)) == VALUES
+
+
+def test_format_matches_dokku():
+    assert _format_env({"B": "it's", "A": "x"}) == "export A='x'\nexport B='it'\\''s'\n"
+
+
+@pytest.mark.parametrize("text", ["export A='unterminated\n", "export A=one two\n", "rm -rf /\n"])
+def test_parse_rejects_unclean_files(text):
+    with pytest.raises(ValueError):
+        _parse_env_file(text)
+
+
+def test_parse_env_keeps_multiline_values():
+    env = DokkuClient()._parse_env(io.StringIO(_format_env(VALUES)))
+    assert {e.key: e.value for e in env} == VALUES
+
+
+def test_update_env_direct_falls_back_on_os_error(monkeypatch):
+    client = DokkuClient()
+
+    def update_env(app_name, updates):
+        raise PermissionError(13, "Permission denied")
+
+    monkeypatch.setattr(client, "_update_env", update_env)
+    assert not asyncio.run(client._update_env_direct("my-app", "KEY", {"KEY": "value"}))
@@ -0,0 +1,104 @@
+"""dokku report parsing."""
+
+import asyncio
+
+import pytest
+
+from app.dokku import AppStatus
+from app.dokku.client import DokkuClient
+
+PS_REPORT = """=====> my-app ps information
+       Deployed:                      true
+       Processes:                     2
+       Ps can scale:                  true
+       Ps restart policy:             on-failure:10
+       Restore:                       true
+       Running:                       {running}
+       Status web 1:                  {web1} (CID: 03ea8977f37)
+       Status web 2:                  {web2} (CID: 9b1c2d3e4f5)
+"""
+
+
+@pytest.mark.parametrize(
+    ("running", "web1", "web2", "expected"),
+    [
+        ("true", "running", "running", AppStatus.RUNNING),
+        ("false", "exited", "exited", AppStatus.STOPPED),
+        ("mixed", "running", "exited", AppStatus.CRASHED),
+        ("mixed", "running", "restarting", AppStatus.RESTARTING),
+    ],
+)
+def test_parse_status(running, web1, web2, expected):
+    client = DokkuClient()
+    output = PS_REPORT.format(running=running, web1=web1, web2=web2)
+    assert client._parse_status(client._report_to_dict(output)) == expected
+
+
+def test_parse_status_without_ps_fields():
+    assert DokkuClient()._parse_status({}) == AppStatus.UNKNOWN
+
+
+def test_app_from_report_reads_ps_section():
+    client = DokkuClient()
+    output = PS_REPORT.format(running="false", web1="exited", web2="exited")
+    app = client._app_from_report("my-app", client._split_report(output)["my-app"])
+    assert app.status == AppStatus.STOPPED
+    assert app.container_count == 2
+
+
+def test_empty_bulk_report_falls_back_to_names_and_is_not_cached(monkeypatch):
+    client = DokkuClient()
+    client.use_docker = False
+
+    async def run_fast(command, timeout=30):
+        return ""  # what run_fast returns on timeout
+
+    async def apps_list():
+        return ["my-app"]
+
+    monkeypatch.setattr(client, "run_fast", run_fast)
+    monkeypatch.setattr(client, "apps_list", apps_list)
+    apps = asyncio.run(client.get_all_apps())
+    assert [(a.name, a.status) for a in apps] == [("my-app", AppStatus.UNKNOWN)]
+    assert not client.all_apps_cached()
+
+
+def test_stream_apps_yields_failed_reports_as_unknown_and_skips_caching(monkeypatch):
+    client = DokkuClient()
+    client.use_docker = False
+
+    async def apps_list():
+        return ["my-app", "broken"]
+
+    async def run(command, timeout=30):
+        if command == "report broken":
+            raise OSError("connection lost")
+        return PS_REPORT.format(running="true", web1="running", web2="running")
+
+    async def collect():
+        return {app.name: app.status async for app in client.stream_apps()}
+
+    monkeypatch.setattr(client, "apps_list", apps_list)
+    monkeypatch.setattr(client, "run", run)
+    assert asyncio.run(collect()) == {"my-app": AppStatus.RUNNING, "broken": AppStatus.UNKNOWN}
+    assert not client.all_apps_cached()
+
+
+def test_invalidate_stops_sharing_in_flight_reports(monkeypatch):
+    client = DokkuClient()
+    calls = []
+
+    async def run_ssh(command, timeout=30):
+        calls.append(command)
+        await asyncio.sleep(0.01)
+        return command
+
+    async def main():
+        before = asyncio.ensure_future(client.run("report my-app"))
+        await asyncio.sleep(0)
+        client._invalidate("my-app")
+        await asyncio.gather(before, client.run("report my-app"))
+
+    monkeypatch.setattr(client, "_run", run_ssh)
+    asyncio.run(main())
+    assert calls == ["report my-app", "report my-app"]
@@ -0,0 +1,38 @@
+"""letsencrypt:list parsing."""
+
+import asyncio
+
+from app.dokku.client import DokkuClient
+
+LETSENCRYPT_LIST = b"""-----> App name           Certificate Expiry        Time before expiry        Time before renewal
+my-app                     2026-01-20 05:25:37       39d, 8h, 3m, 2s           9d, 8h, 3m, 2s
+my-app-2                   2026-01-01 00:00:00       5h, 3m, 2s                0d, 0h, 0m, 0s
+"""
+
+
+def test_certificates_and_app_status_share_one_listing(monkeypatch):
+    client = DokkuClient()
+    calls = []
+
+    async def exec_(*argv, timeout=None):
+        calls.append(argv)
+        return LETSENCRYPT_LIST, b""
+
+    async def collect():
+        return await asyncio.gather(
+            client.ssl_certificates(),
+            client.get_app_ssl_status("my-app"),
+            client.get_app_ssl_status("my-app-2"),
+            client.get_app_ssl_status("other"),
+        )
+
+    monkeypatch.setattr(client, "_exec", exec_)
+    certificates, first, second, other = asyncio.run(collect())
+    assert calls == [("dokku", "letsencrypt:list")]
+    assert [(c.app_name, c.days_until_expiry, c.days_until_renewal) for c in certificates] == [
+        ("my-app", 39, 9),
+        ("my-app-2", 0, 0),
+    ]
+    assert first == {"enabled": True, "expiry_date": "2026-01-20 05:25:37", "days_until_expiry": 39}
+    assert second["days_until_expiry"] == 0
+    assert other == {"enabled": False}